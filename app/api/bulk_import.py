@@ -0,0 +1,59 @@
+"""Import user massal dari file CSV (header: email[,name,pict_uri,google_id]) atau JSON Lines.
+
+    python -m app.api.bulk_import users.csv --batch-size 5000
+
+Tiap batch satu INSERT executemany + satu commit; email yang sudah terdaftar
+dilewati (INSERT IGNORE), jadi aman diulang kalau import terputus di tengah.
+"""
+import argparse
+import csv
+import itertools
+import time
+
+import orjson
+
+from app.api.crud import bulk_insert_users
+from app.models.database import SessionLocal, init_db
+
+FIELDS = ("email", "name", "pict_uri", "google_id")
+
+
+def read_rows(path: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            records = (orjson.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f)
+        for record in records:
+            email = (record.get("email") or "").strip()
+            if not email:
+                continue
+            # semua baris harus punya key yang sama supaya bisa satu executemany
+            yield {field: (record.get(field) or None) for field in FIELDS} | {"email": email}
+
+
+def import_users(path: str, batch_size: int = 5000) -> tuple[int, int]:
+    rows = read_rows(path)
+    total = inserted = 0
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return total, inserted
+        with SessionLocal() as db:
+            inserted += bulk_insert_users(db, batch)
+            db.commit()
+        total += len(batch)
+        print(f"{total} rows read, {inserted} inserted")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    total, inserted = import_users(args.path, args.batch_size)
+    elapsed = time.perf_counter() - started
+    print(f"done: {inserted}/{total} users inserted in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/s)")
@@ -1,7 +1,21 @@
+import dataclasses
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import models
 from app.models.user import User
-from datetime import datetime
+from app.models.refresh_token import UserRefreshToken
+from app.core.session_cache import UserSnapshot
+from app.helper.activity_buffer import activity_buffer
+from app.schemas.user import UserResponse
+
+# Proyeksi kolom buat jalur baca: diturunkan dari schema/snapshot sekali saat import
+# (field yang tidak ada di model langsung AttributeError), baris dibaca sebagai
+# mapping biasa tanpa identity map / relationship loading.
+USER_RESPONSE_COLUMNS = tuple(getattr(User, field) for field in UserResponse.model_fields)
+USER_SNAPSHOT_COLUMNS = tuple(getattr(User, field.name) for field in dataclasses.fields(UserSnapshot))
 
 
 def get_user_by_google_id(db: Session, google_id: str):
@@ -17,12 +31,79 @@ def create_user(db: Session, email: str, name: str, pict_uri: str):
     db.refresh(new_user)
     return new_user
 
-def update_last_login(db: Session, user: models.User):
-    user.last_login = datetime.utcnow()
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+async def upsert_user_by_email(db: AsyncSession, email: str, name: str | None, pict_uri: str | None) -> UserSnapshot:
+    """Ambil-atau-buat user dalam satu statement atomik, balikin profil tersimpan.
+
+    Kalau email sudah ada, name/pict_uri ditimpa dari nilai baru (yang None
+    tidak menimpa nilai lama), jadi profil yang dibalikin diambil dari baris
+    hasil upsert, bukan dari argumen. Login paralel pertama untuk email yang
+    sama tidak lagi balapan di unique index.
+    """
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(User).values(email=email, name=name, pict_uri=pict_uri)
+        # LAST_INSERT_ID(id) bikin lastrowid berisi id baris lama juga saat duplicate
+        stmt = stmt.on_duplicate_key_update(
+            id=func.last_insert_id(User.id),
+            name=func.coalesce(stmt.inserted.name, User.name),
+            pict_uri=func.coalesce(stmt.inserted.pict_uri, User.pict_uri),
+        )
+        user_id = (await db.execute(stmt)).lastrowid
+        # MySQL tidak punya RETURNING: baca ulang di transaksi yang sama
+        profile = await get_user_snapshot(db, user_id)
+    else:
+        # sqlite (dev / benchmark)
+        stmt = sqlite_insert(User).values(email=email, name=name, pict_uri=pict_uri)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.email],
+            set_={
+                "name": func.coalesce(stmt.excluded.name, User.name),
+                "pict_uri": func.coalesce(stmt.excluded.pict_uri, User.pict_uri),
+            },
+        ).returning(*USER_SNAPSHOT_COLUMNS)
+        profile = UserSnapshot(**(await db.execute(stmt)).mappings().one())
+    await db.commit()
+    return profile
+
+def bulk_insert_users(db: Session, rows: list[dict]) -> int:
+    """Insert banyak user sekaligus (executemany), email yang sudah ada dilewati.
+
+    Commit di pemanggil; balikin jumlah baris yang benar-benar masuk.
+    """
+    if not rows:
+        return 0
+    prefix = "IGNORE" if db.bind.dialect.name == "mysql" else "OR IGNORE"
+    # insert ke Table (bukan entity ORM): lewat executemany Core biasa yang
+    # balikin CursorResult + rowcount, bukan jalur ORM bulk
+    result = db.execute(insert(User.__table__).prefix_with(prefix), rows)
+    return result.rowcount
+
+def get_user_row(db: Session, user_id: int):
+    stmt = select(*USER_RESPONSE_COLUMNS).where(User.id == user_id)
+    row = db.execute(stmt).mappings().first()
+    return dict(row) if row else None
+
+def list_user_rows(db: Session, after_id: int | None, limit: int):
+    stmt = select(*USER_RESPONSE_COLUMNS).order_by(User.id).limit(limit)
+    if after_id is not None:
+        stmt = stmt.where(User.id > after_id)
+    return [dict(row) for row in db.execute(stmt).mappings()]
 
+async def get_session_user_snapshot(db: AsyncSession, user_id: int, session_id: str):
+    # cek sesi + ambil profil user dalam satu query
+    stmt = (
+        select(*USER_SNAPSHOT_COLUMNS)
+        .join(UserRefreshToken, UserRefreshToken.user_id == User.id)
+        .where(UserRefreshToken.user_id == user_id, UserRefreshToken.session_id == session_id)
+        .limit(1)
+    )
+    row = (await db.execute(stmt)).mappings().first()
+    return UserSnapshot(**row) if row else None
 
+async def get_user_snapshot(db: AsyncSession, user_id: int):
+    row = (await db.execute(select(*USER_SNAPSHOT_COLUMNS).where(User.id == user_id))).mappings().first()
+    return UserSnapshot(**row) if row else None
 
+def update_last_login(user_id: int):
+    # write-behind: cuma dicatat di memory, UPDATE-nya batch di app.helper.activity_buffer
+    activity_buffer.record_login(user_id)
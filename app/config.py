@@ -10,9 +10,21 @@ class Settings:
     DB_PORT = int(os.getenv("DB_PORT", 3306))
     DB_NAME = os.getenv("DB_NAME")
     DB_SSL_CA = os.getenv("DB_SSL_CA")
-    SQLALCHEMY_DATABASE_URL = (
-        f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", 100))
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 0))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 0))
+    SQLALCHEMY_DATABASE_URL = os.getenv(
+        "SQLALCHEMY_DATABASE_URL",
+        f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
     )
+    SQLALCHEMY_ASYNC_DATABASE_URL = os.getenv(
+        "SQLALCHEMY_ASYNC_DATABASE_URL",
+        f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
+    )
+    # read replica (dipisah koma); kosong = semua baca ke primary
+    DB_REPLICA_URLS = os.getenv("DB_REPLICA_URLS", "")
+    DB_STICKY_SECONDS = float(os.getenv("DB_STICKY_SECONDS", 5))
+    DB_REPLICA_CHECK_SECONDS = float(os.getenv("DB_REPLICA_CHECK_SECONDS", 10))
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
     
     GOOGLE_TOKEN_ENDPOINT = os.getenv("GOOGLE_TOKEN_ENDPOINT")
@@ -22,7 +34,15 @@ class Settings:
     GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
     GOOGLE_OAUTH_ENDPOINT = os.getenv("GOOGLE_OAUTH_ENDPOINT")
     GOOGLE_OAUTH_USERINFO = os.getenv("GOOGLE_OAUTH_USERINFO")
+    GOOGLE_JWKS_URI = os.getenv("GOOGLE_JWKS_URI", "https://www.googleapis.com/oauth2/v3/certs")
+    
     
+    HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", 100))
+    HTTP_CLIENT_MAX_KEEPALIVE = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", 20))
+    HTTP_CLIENT_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", 60))
+    HTTP_CLIENT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CLIENT_TIMEOUT_SECONDS", 10))
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS", 5))
+    HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() == "true"
     
     APP_REDIRECT_URI = os.getenv("APP_REDIRECT_URI")
     APP_URL_API = os.getenv("APP_URL_API")
@@ -30,10 +50,73 @@ class Settings:
     ALGORITHM = os.getenv("ALGORITHM")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_EXPIRE_IN_MINUTES = os.getenv("JWT_EXPIRE_IN_MINUTES")
+    # ALGORITHM=ES256 / EdDSA: token ditandatangani private key ini, public key-nya di /.well-known/jwks.json
+    JWT_PRIVATE_KEY_FILE = os.getenv("JWT_PRIVATE_KEY_FILE")
+    JWT_KEY_ID = os.getenv("JWT_KEY_ID")
     
+    MAX_SESSIONS_PER_USER = int(os.getenv("MAX_SESSIONS_PER_USER", 1))
+
+    # access token membawa profil user; DB tidak dicek per request, pencabutan lewat denylist
+    AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() == "true"
+    REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", 5))
+    # refresh token yang baru di-rotate masih diterima selama ini (balikin pasangan token yang sama)
+    REFRESH_GRACE_SECONDS = float(os.getenv("REFRESH_GRACE_SECONDS", 10))
+
+    TOKEN_REAPER_ENABLED = os.getenv("TOKEN_REAPER_ENABLED", "true").lower() == "true"
+    TOKEN_REAPER_INTERVAL_SECONDS = float(os.getenv("TOKEN_REAPER_INTERVAL_SECONDS", 600))
+    TOKEN_REAPER_BATCH_SIZE = int(os.getenv("TOKEN_REAPER_BATCH_SIZE", 500))
+    TOKEN_REAPER_BATCH_PAUSE_SECONDS = float(os.getenv("TOKEN_REAPER_BATCH_PAUSE_SECONDS", 0.5))
+    TOKEN_REAPER_LEASE_SECONDS = int(os.getenv("TOKEN_REAPER_LEASE_SECONDS", 300))
+
+    USERS_PAGE_DEFAULT = int(os.getenv("USERS_PAGE_DEFAULT", 50))
+    USERS_PAGE_MAX = int(os.getenv("USERS_PAGE_MAX", 200))
+    USERS_STREAM_BATCH_SIZE = int(os.getenv("USERS_STREAM_BATCH_SIZE", 1000))
+
+    # last_login_at / last_seen_at ditulis batch (write-behind) tiap interval ini
+    ACTIVITY_FLUSH_SECONDS = float(os.getenv("ACTIVITY_FLUSH_SECONDS", 30))
+    ACTIVITY_BUFFER_MAX = int(os.getenv("ACTIVITY_BUFFER_MAX", 50000))
+
+    # /metrics cuma dilayani kalau token ini diset; Prometheus kirim
+    # "Authorization: Bearer <token>" (bearer_token di scrape config)
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    # harus satu file yang sama untuk semua worker; jangan di /tmp (hilang saat
+    # reboot, dan beda per service kalau systemd PrivateTmp=yes)
+    RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "app/ratelimit.db")
+    LOGIN_EMAIL_BURST = int(os.getenv("LOGIN_EMAIL_BURST", 5))
+    LOGIN_EMAIL_PER_MINUTE = int(os.getenv("LOGIN_EMAIL_PER_MINUTE", 5))
+    LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", 20))
+    LOGIN_IP_PER_MINUTE = int(os.getenv("LOGIN_IP_PER_MINUTE", 30))
+    SET_PASS_BURST = int(os.getenv("SET_PASS_BURST", 3))
+    SET_PASS_PER_MINUTE = int(os.getenv("SET_PASS_PER_MINUTE", 3))
+
+    SESSION_CACHE_TTL_SECONDS = int(os.getenv("SESSION_CACHE_TTL_SECONDS", 30))
+    SESSION_CACHE_MAX_SIZE = int(os.getenv("SESSION_CACHE_MAX_SIZE", 10000))
+
+    RSA_KEYS_DIR = os.getenv("RSA_KEYS_DIR", "app/keys")
+    RSA_ACTIVE_KID = os.getenv("RSA_ACTIVE_KID")
+    RSA_KEYS_RELOAD_SECONDS = float(os.getenv("RSA_KEYS_RELOAD_SECONDS", 5))
+
+    HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", 0))
+    HASH_POOL_MAX_QUEUE = int(os.getenv("HASH_POOL_MAX_QUEUE", 32))
+
+    # cost bcrypt dikalibrasi saat startup ke target ini; BCRYPT_ROUNDS mengunci cost secara manual
+    BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", 250))
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 0))
+    BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", 10))
+    BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", 16))
+
     SSL_KEYFILE = os.getenv("SSL_KEYFILE")
     SSL_CERTFILE = os.getenv("SSL_CERTFILE")
+
+    APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
+    APP_PORT = int(os.getenv("APP_PORT", 4000))
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 0))
+    GRACEFUL_TIMEOUT_SECONDS = int(os.getenv("GRACEFUL_TIMEOUT_SECONDS", 30))
+    KEEP_ALIVE_SECONDS = int(os.getenv("KEEP_ALIVE_SECONDS", 5))
     
     APP_ROOT_DOMAIN = os.getenv("APP_ROOT_DOMAIN")
+    CORS_MAX_AGE = int(os.getenv("CORS_MAX_AGE", 86400))
 
 settings = Settings()
@@ -1,18 +1,29 @@
 import httpx
+from datetime import datetime
 from fastapi import Request, Response, HTTPException
-from fastapi.responses import JSONResponse
-from jose import jwt, JWTError, ExpiredSignatureError
-from sqlalchemy.orm import Session, joinedload
-from passlib.context import CryptContext
+from app.core.responses import FastJSONResponse, PreEncodedJSONResponse, LOGGED_OUT_BODY
+from jose import JWTError
+from sqlalchemy import select, delete
+from sqlalchemy.orm import joinedload
 
 from app.config import settings
 from app.models.refresh_token import UserRefreshToken
 from app.helper.token_service import TokenService
+from app.helper.refresh_coalescer import refresh_coalescer
 from app.models.user import User
-from app.api.crud import create_user, get_user_by_email
+from app.models import routing
+from app.api.crud import update_last_login, upsert_user_by_email
 from app.core.crypto import decrypt_password
+from app.core.secure import hash_token
+from app.core.token_backend import token_backend, TokenError, ExpiredTokenError
+from app.core.session_cache import session_cache, UserSnapshot
+from app.core.revocation import revocation_list
+from app.core.passwords import password_service
+from app.core import metrics
+from app.core.rate_limit import enforce_rate_limit, bucket
+from app.core.http_client import http_client
+from app.core.google_jwks import verify_google_id_token
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # token_service = TokenService()
 
 class AuthController:
@@ -20,36 +31,50 @@ class AuthController:
         self.db = db
        
     # login biasa pake email & password =============================================================================
-    async def login(self, payload: dict, response: JSONResponse):
+    async def login(self, payload: dict, request: Request):
         db = self.db
         token_service = TokenService(db)
 
         email = payload.get("_e")
         encrypted_password = payload.get("_p")
+        key_id = payload.get("_k")
 
         if not email or not encrypted_password:
             raise HTTPException(status_code=400, detail="Email and password required")
 
-        user = (
-            db.query(User)
+        # throttle sebelum query DB / RSA / bcrypt
+        client_ip = request.client.host if request.client else "unknown"
+        await enforce_rate_limit([
+            bucket(f"signin:email:{email.lower()}", settings.LOGIN_EMAIL_BURST, settings.LOGIN_EMAIL_PER_MINUTE),
+            bucket(f"signin:ip:{client_ip}", settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE),
+        ])
+
+        result = await db.execute(
+            select(User)
             .options(joinedload(User.privacy))
-            .filter(User.email == email)
-            .first()
+            .where(User.email == email)
         )
+        user = result.scalars().first()
 
         if not user or not user.privacy:
             raise HTTPException(status_code=401, detail="Invalid credentials")
         try:
-            password = decrypt_password(encrypted_password)
+            password = decrypt_password(encrypted_password, kid=key_id)
         except Exception as e:
             print("decrypt error:", e)
             raise HTTPException(status_code=400, detail="Invalid encryption data")
 
-        if not pwd_context.verify(password, user.privacy.user_password):
+        verified, new_hash = await password_service.verify(password, user.privacy.user_password)
+        if not verified:
             raise HTTPException(status_code=401, detail="Invalid credentials")
-
-        access_token, refresh_token, access_exp, refresh_exp = token_service.generate_tokens(user.id)
-        response = JSONResponse(content={"message": "Login succeed", "user": user.email})
+        if new_hash:
+            # cost bcrypt sudah berubah; ikut ke-commit bareng sesi baru di generate_tokens
+            user.privacy.user_password = new_hash
+
+        profile = UserSnapshot(id=user.id, email=user.email, name=user.name, pict_uri=user.pict_uri)
+        access_token, refresh_token, access_exp, refresh_exp = await token_service.generate_tokens(user.id, profile)
+        update_last_login(user.id)
+        response = FastJSONResponse(content={"message": "Login succeed", "user": user.email})
         return token_service.set_auth_cookies(response, access_token, refresh_token, access_exp, refresh_exp)
 
     # refresh & access token ==========================================================================================
@@ -61,39 +86,30 @@ class AuthController:
 
         # Verifikasi JWT refresh token
         try:
-            decoded_token = jwt.decode(
-                refresh_token,
-                settings.JWT_SECRET_KEY,
-                algorithms=[settings.ALGORITHM],
-            )
+            with metrics.timed("jwt_decode"):
+                decoded_token = token_backend.decode(refresh_token)
             if decoded_token.get("type") != "refresh":
                 raise HTTPException(status_code=400, detail="Invalid token type")
 
             user_id = decoded_token.get("sub")
-            if not user_id:
+            session_id = decoded_token.get("session_id")
+            if not user_id or not session_id:
                 raise HTTPException(status_code=400, detail="Invalid token payload")
 
-        except ExpiredSignatureError:
+        except ExpiredTokenError:
             raise HTTPException(status_code=401, detail="Refresh token expired")
-        except JWTError:
+        except TokenError:
             raise HTTPException(status_code=401, detail="Invalid refresh token")
 
-        db_token = (
-            db.query(UserRefreshToken)
-            .filter(
-                UserRefreshToken.user_id == user_id,
-                UserRefreshToken.token == refresh_token,
-            )
-            .first()
-        )
-        
-        if not db_token:
-            raise HTTPException(status_code=401, detail="Refresh token not found")
-
+        # lookup + rotasi sekaligus (UPDATE baris sesi ini kalau token-nya masih cocok);
+        # refresh paralel dengan token yang sama cuma jalan sekali
         token_service = TokenService(db)
-        access_token, new_refresh_token, access_exp, refresh_exp = token_service.generate_tokens(user_id)
+        tokens = await refresh_coalescer.rotate(user_id, session_id, refresh_token)
+        if tokens is None:
+            raise HTTPException(status_code=401, detail="Refresh token not found")
+        access_token, new_refresh_token, access_exp, refresh_exp = tokens
 
-        res = JSONResponse({
+        res = FastJSONResponse({
             "access_token": access_token,
             "refresh_token": new_refresh_token,
             "token_type": "Bearer",
@@ -117,10 +133,10 @@ class AuthController:
                 "grant_type": "authorization_code",
             }
 
+            client = http_client.client
             try:
-                async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-                    token_res = await client.post(settings.GOOGLE_TOKEN_ENDPOINT, data=data)
-                    token_json = token_res.json()
+                token_res = await client.post(settings.GOOGLE_TOKEN_ENDPOINT, data=data)
+                token_json = token_res.json()
             except httpx.ConnectTimeout:
                 raise HTTPException(status_code=500, detail="Connection to Google timed out")
             except httpx.HTTPStatusError as e:
@@ -129,14 +145,27 @@ class AuthController:
             if "error" in token_json:
                 raise HTTPException(status_code=400, detail=token_json["error"])
 
-            # Ambil data user dari google
+            # Ambil data user dari id_token (diverifikasi lokal pakai JWKS cache),
+            # userinfo endpoint cuma fallback kalau id_token tidak ada / JWKS tidak bisa diambil
             access_token = token_json.get("access_token")
-            async with httpx.AsyncClient() as client:
+            id_token = token_json.get("id_token")
+            userinfo = None
+            if id_token:
+                try:
+                    userinfo = await verify_google_id_token(id_token, access_token=access_token)
+                except JWTError as e:
+                    raise HTTPException(status_code=401, detail=f"Invalid Google id_token: {e}")
+                except httpx.HTTPError as e:
+                    print("jwks fetch error:", e)
+
+            if userinfo is None:
                 userinfo_res = await client.get(
                     settings.GOOGLE_OAUTH_USERINFO,
-                    headers={"Authorization": f"Bearer {access_token}"}
+                    headers={"Authorization": f"Bearer {access_token}"},
                 )
                 userinfo = userinfo_res.json()
+                if userinfo.get("email_verified") is False:
+                    raise HTTPException(status_code=401, detail="Google email is not verified")
 
             email = userinfo.get("email")
             name = userinfo.get("name")
@@ -145,21 +174,26 @@ class AuthController:
             if not email:
                 raise HTTPException(status_code=400, detail="Google userinfo failed")
 
-            # Cek / create user
-            user = get_user_by_email(db, email)
-            if not user:
-                user = create_user(db, email=email, name=name, pict_uri=pict_uri)
+            # get-or-create user dalam satu upsert (aman untuk login pertama yang paralel)
+            # profil dari baris tersimpan: field yang tidak dikirim Google tetap nilai lama
+            profile = await upsert_user_by_email(db, email=email, name=name, pict_uri=pict_uri)
+            user_id = profile.id
+            routing.mark_written(user_id)
 
             token_service = TokenService(db)
-            access_token, refresh_token, access_exp, refresh_exp = token_service.generate_tokens(user.id)
+            access_token, refresh_token, access_exp, refresh_exp = await token_service.generate_tokens(user_id, profile)
+            update_last_login(user_id)
 
-            response = JSONResponse({
+            response = FastJSONResponse({
                 "message": "Login successful",
-                "user": {"id": user.id, "email": user.email, "name": user.name},
+                "user": {"id": user_id, "email": profile.email, "name": profile.name},
             })
 
             return token_service.set_auth_cookies(response, access_token, refresh_token, access_exp, refresh_exp)
 
+        except HTTPException:
+            # error yang memang sengaja (400/401/...) jangan dibungkus jadi 500
+            raise
         except Exception as e:
             import traceback
             print("CALLBACK ERROR:", str(e))
@@ -170,12 +204,30 @@ class AuthController:
         refresh_token = request.cookies.get("refresh_token")
 
         if refresh_token:
-            self.db.query(UserRefreshToken).filter(
-                UserRefreshToken.token == refresh_token
-            ).delete()
-            self.db.commit()
+            # signature tidak perlu dicek: claims cuma dipakai kalau token-nya
+            # memang cocok dengan baris sesi yang dihapus
+            try:
+                claims = token_backend.unverified_claims(refresh_token)
+            except TokenError:
+                claims = {}
 
-        response = JSONResponse({"message": "Logged Out"})
+            result = await self.db.execute(
+                delete(UserRefreshToken).where(UserRefreshToken.token_hash == hash_token(refresh_token))
+            )
+            revoked = []
+            if settings.AUTH_STATELESS and result.rowcount == 1 and claims.get("session_id"):
+                revoked = [claims["session_id"]]
+                revoked_until = datetime.utcnow() + TokenService.access_token_expires
+                revocation_list.stage(self.db, revoked, revoked_until)
+            await self.db.commit()
+            if revoked:
+                revocation_list.add(revoked, revoked_until)
+
+            if claims.get("sub") and claims.get("session_id"):
+                session_cache.invalidate(claims["sub"], claims["session_id"])
+                refresh_coalescer.forget_session(claims["session_id"])
+
+        response = PreEncodedJSONResponse(LOGGED_OUT_BODY)
         response.delete_cookie("access_token")
         response.delete_cookie("refresh_token")
 
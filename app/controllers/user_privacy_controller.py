@@ -1,20 +1,18 @@
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from fastapi.responses import JSONResponse
+from app.core.responses import FastJSONResponse
 from app.models.user_privacy import UserPrivacy
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.passwords import password_service
 
 class UserPrivacyController:
     @staticmethod
-    def set_or_update_password(db: Session, user_id: int, password: str):
+    async def set_or_update_password(db: Session, user_id: int, password: str):
         if not password or len(password) < 8:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={"message": "Password must be at least 8 characters"},
                 status_code=422
             )
 
-        hashed = pwd_context.hash(password)
+        hashed = await password_service.hash(password)
         privacy = db.query(UserPrivacy).filter(UserPrivacy.user_id == user_id).first()
 
         if privacy:
@@ -24,4 +22,4 @@ class UserPrivacyController:
             db.add(privacy)
 
         db.commit()
-        return JSONResponse(content={"message": "Password has been set successfully"}, status_code=200)
+        return FastJSONResponse(content={"message": "Password has been set successfully"}, status_code=200)
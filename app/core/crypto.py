@@ -1,19 +1,133 @@
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives import serialization
 from fastapi import HTTPException
+from app.config import settings
+from app.core import metrics
 import base64
+import os
+import threading
+import time
 
-def decrypt_password(encrypted_password: str):
+
+class RSAKeyRing:
+    """Private key RSA buat decrypt password dari frontend, di-load sekali ke memory.
+
+    Setiap file ``<kid>.pem`` di ``keys_dir`` jadi satu key id (``private.pem`` lama
+    otomatis jadi kid ``private``). Folder dicek ulang paling sering tiap
+    ``reload_interval`` detik dan hanya di-parse ulang kalau ada file yang berubah.
+    """
+
+    def __init__(self, keys_dir: str, active_kid: str | None = None, reload_interval: float = 5.0):
+        self.keys_dir = keys_dir
+        self.preferred_kid = active_kid
+        self.reload_interval = reload_interval
+        self._keys = {}
+        self._public_pems = {}
+        self._active_kid = None
+        self._fingerprint = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def active_kid(self):
+        self._maybe_reload()
+        return self._active_kid
+
+    def load(self):
+        with self._lock:
+            self._load_locked(self._scan())
+
+    def decrypt(self, ciphertext: bytes, kid: str | None = None) -> bytes:
+        """Decrypt pakai key ``kid``; tanpa kid cuma boleh kalau key-nya tinggal satu.
+
+        PKCS#1 v1.5 di ``cryptography`` pakai implicit rejection: key yang salah
+        balikin byte acak, bukan ``ValueError``, jadi tidak bisa coba key satu per
+        satu. Selama rotasi (lebih dari satu key) client wajib kirim kid.
+        """
+        self._maybe_reload()
+        keys = self._keys
+        if not kid:
+            if len(keys) != 1:
+                raise KeyError(f"key id required, {len(keys)} RSA keys loaded")
+            kid = next(iter(keys))
+        if kid not in keys:
+            raise KeyError(f"unknown key id {kid!r}")
+        return keys[kid].decrypt(ciphertext, padding.PKCS1v15())
+
+    def public_keys(self):
+        self._maybe_reload()
+        return [
+            {"kid": kid, "active": kid == self._active_kid, "pem": pem}
+            for kid, pem in self._public_pems.items()
+        ]
+
+    def _scan(self):
+        entries = []
+        try:
+            with os.scandir(self.keys_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(".pem"):
+                        stat = entry.stat()
+                        entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            pass
+        return tuple(sorted(entries))
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            fingerprint = self._scan()
+            if fingerprint != self._fingerprint:
+                try:
+                    self._load_locked(fingerprint)
+                except Exception as e:
+                    # file mungkin lagi ditulis, pakai key lama dulu
+                    print("key ring reload error:", e)
+            self._next_check = now + self.reload_interval
+
+    def _load_locked(self, fingerprint):
+        keys = {}
+        public_pems = {}
+        newest = None
+        for name, mtime_ns, _ in fingerprint:
+            kid = name[: -len(".pem")]
+            with open(os.path.join(self.keys_dir, name), "rb") as key_file:
+                private_key = serialization.load_pem_private_key(key_file.read(), password=None)
+            keys[kid] = private_key
+            public_pems[kid] = private_key.public_key().public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            ).decode("ascii")
+            if newest is None or mtime_ns > newest[1]:
+                newest = (kid, mtime_ns)
+
+        if self.preferred_kid in keys:
+            active_kid = self.preferred_kid
+        else:
+            active_kid = newest[0] if newest else None
+
+        self._keys = keys
+        self._public_pems = public_pems
+        self._active_kid = active_kid
+        self._fingerprint = fingerprint
+        self._next_check = time.monotonic() + self.reload_interval
+
+
+key_ring = RSAKeyRing(
+    settings.RSA_KEYS_DIR,
+    active_kid=settings.RSA_ACTIVE_KID,
+    reload_interval=settings.RSA_KEYS_RELOAD_SECONDS,
+)
+
+
+def decrypt_password(encrypted_password: str, kid: str | None = None):
     try:
-        with open('app/keys/private.pem', 'rb') as key_file:
-            private_key = serialization.load_pem_private_key(
-                key_file.read(),
-                password=None,
-            )
-        decrypted = private_key.decrypt(
-            base64.b64decode(encrypted_password),
-            padding.PKCS1v15()
-        )
+        with metrics.timed("rsa_decrypt"):
+            decrypted = key_ring.decrypt(base64.b64decode(encrypted_password), kid=kid)
         return decrypted.decode('utf-8')
     except Exception as e:
         print("decrypt error:", e)
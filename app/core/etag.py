@@ -0,0 +1,43 @@
+import dataclasses
+import hashlib
+from functools import lru_cache
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.responses import FastJSONResponse
+
+# boleh disimpan browser, tapi selalu revalidasi pakai If-None-Match
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def etag_for(values) -> str:
+    """Strong ETag dari isi (hash nilai-nilai field, urutannya ikut dihitung)."""
+    digest = hashlib.blake2b(orjson.dumps(values), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+@lru_cache(maxsize=4096)
+def snapshot_etag(snapshot) -> str:
+    # snapshot frozen dataclass (hashable): user yang sama -> tidak di-hash ulang tiap poll
+    return etag_for(dataclasses.astuple(snapshot))
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match pakai weak comparison (RFC 9110 13.1.2)
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def conditional_json(request: Request, etag: str, render, headers: dict | None = None) -> Response:
+    """304 tanpa body kalau ETag cocok; ``render()`` cuma dipanggil untuk respons 200."""
+    headers = {"ETag": etag, "Cache-Control": PRIVATE_REVALIDATE, **(headers or {})}
+    if if_none_match(request, etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(content=render(), headers=headers)
@@ -0,0 +1,109 @@
+import asyncio
+import re
+import time
+
+from jose import jwt, JWTError
+
+from app.config import settings
+from app.core.http_client import http_client
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    """Cache JWKS Google buat verifikasi ``id_token`` secara lokal.
+
+    Umur cache ikut ``Cache-Control: max-age`` dari Google. Kalau sudah mendekati
+    kadaluarsa, refresh jalan di background sementara key lama tetap dipakai;
+    ``kid`` yang tidak dikenal memicu satu refresh paksa (dibatasi
+    ``min_refresh_interval`` supaya token palsu tidak bisa nge-spam Google).
+    """
+
+    def __init__(self, uri: str, default_max_age: int = 3600, min_refresh_interval: float = 30.0):
+        self.uri = uri
+        self.default_max_age = default_max_age
+        self.min_refresh_interval = min_refresh_interval
+        self._keys = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._refreshing = None
+        self.fetches = 0
+
+    async def get_key(self, kid: str) -> dict:
+        now = time.monotonic()
+        if not self._keys or now >= self._expires_at:
+            await self.refresh()
+        elif now >= self._expires_at - self.default_max_age * 0.1:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._last_fetch >= self.min_refresh_interval:
+            # Google baru rotasi key
+            await self.refresh()
+            key = self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown key id {kid!r}")
+        return key
+
+    async def refresh(self):
+        # beberapa request yang kena miss bareng cukup nunggu satu fetch
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._fetch())
+        task = self._refreshing
+        try:
+            await asyncio.shield(task)
+        finally:
+            if task.done() and self._refreshing is task:
+                self._refreshing = None
+
+    def _refresh_in_background(self):
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._fetch())
+            self._refreshing.add_done_callback(self._background_done)
+
+    def _background_done(self, task):
+        if self._refreshing is task:
+            self._refreshing = None
+        if not task.cancelled() and task.exception() is not None:
+            print("jwks refresh error:", task.exception())
+
+    async def _fetch(self):
+        res = await http_client.client.get(self.uri)
+        res.raise_for_status()
+        keys = {key["kid"]: key for key in res.json().get("keys", []) if "kid" in key}
+
+        max_age = self.default_max_age
+        match = _MAX_AGE_RE.search(res.headers.get("cache-control", ""))
+        if match:
+            max_age = int(match.group(1))
+
+        now = time.monotonic()
+        self._keys = keys
+        self._expires_at = now + max_age
+        self._last_fetch = now
+        self.fetches += 1
+
+
+google_jwks = JWKSCache(settings.GOOGLE_JWKS_URI)
+
+
+async def verify_google_id_token(id_token: str, access_token: str | None = None) -> dict:
+    """Verifikasi signature + claims ``id_token`` Google, balikin claims-nya.
+
+    Email yang belum diverifikasi Google ditolak (bisa dipakai ngaku-ngaku
+    email orang lain di akun Google non-Gmail).
+    """
+    header = jwt.get_unverified_header(id_token)
+    key = await google_jwks.get_key(header.get("kid"))
+    claims = jwt.decode(
+        id_token,
+        key,
+        algorithms=[key.get("alg", "RS256")],
+        audience=settings.GOOGLE_CLIENT_ID,
+        issuer=GOOGLE_ISSUERS,
+        access_token=access_token,
+    )
+    if claims.get("email_verified") not in (True, "true"):
+        raise JWTError("Google email is not verified")
+    return claims
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app.core import metrics
+
+
+class HashPool:
+    """Executor khusus buat bcrypt hash/verify supaya tidak nge-block event loop.
+
+    Pakai thread pool: bcrypt melepas GIL selama hashing, jadi thread sudah
+    jalan paralel tanpa biaya pickling process pool. Antrian dibatasi; kalau
+    penuh request langsung ditolak 503 daripada numpuk di belakang.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._pending = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.run_seconds_total = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self._pending - self._running, 0)
+
+    async def run(self, fn, *args, op: str = "bcrypt"):
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pwd-hash")
+
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args), started - submitted, time.perf_counter() - started
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        self._pending += 1
+        try:
+            result, waited, took = await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self._pending -= 1
+
+        with self._lock:
+            self.completed += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            self.run_seconds_total += took
+        metrics.observe_crypto(op, took)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self.queue_depth,
+                "running": self._running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_avg": (self.wait_seconds_total / self.completed) if self.completed else 0.0,
+                "run_seconds_total": self.run_seconds_total,
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hash_pool = HashPool(
+    max_workers=settings.HASH_POOL_WORKERS or min(4, os.cpu_count() or 1),
+    max_queue=settings.HASH_POOL_MAX_QUEUE,
+)
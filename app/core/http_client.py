@@ -0,0 +1,105 @@
+import importlib.util
+
+import httpx
+
+from app.config import settings
+
+
+class SharedHTTPClient:
+    """Satu ``httpx.AsyncClient`` untuk seluruh umur aplikasi (Google OAuth dll).
+
+    Koneksi di-pool dan keep-alive, jadi login berikutnya tidak perlu handshake
+    TCP+TLS lagi. Dibuat di startup, ditutup di shutdown; ``transport`` bisa
+    diganti (mis. ``httpx.MockTransport``) buat test/benchmark.
+    """
+
+    def __init__(self):
+        self._client = None
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.transport_errors = 0
+        self.error_responses = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # dipakai di luar lifespan (script/CLI): buat lazily
+            self._client = self._build()
+        return self._client
+
+    async def start(self, transport: httpx.AsyncBaseTransport | None = None):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = self._build(transport)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        # httpx tidak punya API publik buat isi pool, jadi yang dilaporkan cuma hitungan sendiri
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "transport_errors": self.transport_errors,
+            "error_responses": self.error_responses,
+            "max_connections": settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            "http2": settings.HTTP_CLIENT_HTTP2 and _h2_installed(),
+        }
+
+    def _build(self, transport=None) -> httpx.AsyncClient:
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                http2=settings.HTTP_CLIENT_HTTP2 and _h2_installed(),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return httpx.AsyncClient(timeout=default_timeout(), transport=_CountingTransport(transport, self))
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """Bungkus transport asli supaya request yang gagal di level koneksi ikut terhitung."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, owner: SharedHTTPClient):
+        self.inner = inner
+        self.owner = owner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        owner = self.owner
+        owner.requests += 1
+        owner.in_flight += 1
+        owner.max_in_flight = max(owner.max_in_flight, owner.in_flight)
+        try:
+            response = await self.inner.handle_async_request(request)
+        except Exception:
+            owner.transport_errors += 1
+            raise
+        finally:
+            owner.in_flight -= 1
+        if response.status_code >= 400:
+            owner.error_responses += 1
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+def _h2_installed() -> bool:
+    # http2 butuh paket `h2` (httpx[http2]); kalau tidak ada, fallback ke HTTP/1.1
+    return importlib.util.find_spec("h2") is not None
+
+
+def default_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+        connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+    )
+
+
+http_client = SharedHTTPClient()
@@ -0,0 +1,214 @@
+"""Instrumentasi ringan (tanpa dependency) dengan output format teks Prometheus.
+
+Hot path cuma increment angka di dict/list; semua format teks dikerjakan
+saat ``/metrics`` di-scrape.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+CRYPTO_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestStats:
+    __slots__ = ("sql_count", "sql_seconds")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+_lock = threading.Lock()
+
+_http_latency: dict[tuple[str, str], Histogram] = {}
+_http_requests: dict[tuple[str, str, str], int] = {}
+_sql_by_route: dict[str, list] = {}
+_crypto: dict[str, Histogram] = {}
+_pool_wait: dict[str, Histogram] = {}
+_pool_connects: dict[str, int] = {}
+# sumber gauge tambahan (hash pool, session cache, ...): nama -> callable yang balikin dict angka
+_collectors = {}
+
+
+def start_request() -> tuple[RequestStats, object]:
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def finish_request(stats: RequestStats, reset_token, method: str, route: str, status: int, seconds: float):
+    _request_stats.reset(reset_token)
+    with _lock:
+        histogram = _http_latency.get((method, route))
+        if histogram is None:
+            histogram = _http_latency[(method, route)] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+        key = (method, route, str(status))
+        _http_requests[key] = _http_requests.get(key, 0) + 1
+        sql = _sql_by_route.get(route)
+        if sql is None:
+            sql = _sql_by_route[route] = [0, 0.0]
+        sql[0] += stats.sql_count
+        sql[1] += stats.sql_seconds
+
+
+def observe_crypto(op: str, seconds: float):
+    with _lock:
+        histogram = _crypto.get(op)
+        if histogram is None:
+            histogram = _crypto[op] = Histogram(CRYPTO_BUCKETS)
+        histogram.observe(seconds)
+
+
+class timed:
+    """``with timed("jwt_decode"): ...`` -> masuk histogram crypto."""
+
+    __slots__ = ("op", "started")
+
+    def __init__(self, op: str):
+        self.op = op
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe_crypto(self.op, time.perf_counter() - self.started)
+        return False
+
+
+def register_collector(name: str, collect):
+    _collectors[name] = collect
+
+
+def instrument_engine(engine, name: str):
+    """Hitung jumlah + durasi statement SQL per route dan waktu tunggu checkout pool."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.sql_count += 1
+            stats.sql_seconds += time.perf_counter() - started
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("metrics_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    # Pool tidak punya event "sebelum checkout" (event "checkout" baru jalan
+    # sesudah dapat koneksi), jadi yang diukur pemanggilan engine.connect():
+    # Session, AsyncEngine dan engine.begin() semuanya lewat sini. Termasuk
+    # waktu buka koneksi baru kalau pool belum punya yang idle.
+    with _lock:
+        histogram = _pool_wait.setdefault(name, Histogram(POOL_WAIT_BUCKETS))
+        _pool_connects.setdefault(name, 0)
+    connect = sync_engine.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            waited = time.perf_counter() - started
+            with _lock:
+                histogram.observe(waited)
+
+    sync_engine.connect = timed_connect
+
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        with _lock:
+            _pool_connects[name] += 1
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _render_histogram(lines, metric, histogram, **labels):
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f"{metric}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{metric}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+    lines.append(f"{metric}_sum{_labels(**labels)} {histogram.sum}")
+    lines.append(f"{metric}_count{_labels(**labels)} {histogram.count}")
+
+
+def render() -> str:
+    lines = []
+    with _lock:
+        lines.append("# HELP exordium_http_request_duration_seconds Request latency per route.")
+        lines.append("# TYPE exordium_http_request_duration_seconds histogram")
+        for (method, route), histogram in _http_latency.items():
+            _render_histogram(lines, "exordium_http_request_duration_seconds", histogram, method=method, route=route)
+
+        lines.append("# HELP exordium_http_requests_total Requests per route and status.")
+        lines.append("# TYPE exordium_http_requests_total counter")
+        for (method, route, status), count in _http_requests.items():
+            lines.append(f"exordium_http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        lines.append("# HELP exordium_db_statements_total SQL statements executed per route.")
+        lines.append("# TYPE exordium_db_statements_total counter")
+        for route, (count, _) in _sql_by_route.items():
+            lines.append(f"exordium_db_statements_total{_labels(route=route)} {count}")
+        lines.append("# HELP exordium_db_statement_seconds_total Time spent in SQL statements per route.")
+        lines.append("# TYPE exordium_db_statement_seconds_total counter")
+        for route, (_, seconds) in _sql_by_route.items():
+            lines.append(f"exordium_db_statement_seconds_total{_labels(route=route)} {seconds}")
+
+        lines.append("# HELP exordium_crypto_duration_seconds Time spent in bcrypt, RSA decrypt and JWT encode/decode.")
+        lines.append("# TYPE exordium_crypto_duration_seconds histogram")
+        for op, histogram in _crypto.items():
+            _render_histogram(lines, "exordium_crypto_duration_seconds", histogram, op=op)
+
+        lines.append("# HELP exordium_db_pool_checkout_wait_seconds Time waiting for a pooled DB connection.")
+        lines.append("# TYPE exordium_db_pool_checkout_wait_seconds histogram")
+        for name, histogram in _pool_wait.items():
+            _render_histogram(lines, "exordium_db_pool_checkout_wait_seconds", histogram, engine=name)
+
+        lines.append("# HELP exordium_db_pool_connections_opened_total New DB connections opened by the pool.")
+        lines.append("# TYPE exordium_db_pool_connections_opened_total counter")
+        for name, count in _pool_connects.items():
+            lines.append(f"exordium_db_pool_connections_opened_total{_labels(engine=name)} {count}")
+
+    for source, collect in list(_collectors.items()):
+        for key, value in collect().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            lines.append(f"# HELP exordium_{source}_{key} {source} {key.replace('_', ' ')}.")
+            lines.append(f"# TYPE exordium_{source}_{key} gauge")
+            lines.append(f"exordium_{source}_{key} {value}")
+    return "\n".join(lines) + "\n"
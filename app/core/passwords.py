@@ -0,0 +1,114 @@
+import threading
+import time
+
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.core.hash_pool import hash_pool
+
+
+class PasswordService:
+    """Satu-satunya tempat hash/verify password (bcrypt), dipakai login dan set-pass.
+
+    Cost bcrypt dipilih dari pengukuran: hash di cost kecil diukur beberapa kali,
+    lalu diambil cost terbesar yang perkiraan waktunya masih di bawah
+    ``target_ms`` (tiap +1 round = 2x lebih lama). ``rounds`` dari env mengunci
+    cost tanpa kalibrasi; ``run.py`` mengisi env ini supaya semua worker sepakat.
+
+    Hash tersimpan yang cost-nya beda dari cost aktif ditandai ``needs_update``
+    dan di-hash ulang saat login berikutnya berhasil.
+    """
+
+    def __init__(self, target_ms: float, rounds: int = 0, min_rounds: int = 10, max_rounds: int = 16):
+        self.target_ms = target_ms
+        self.fixed_rounds = rounds
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self._context = None
+        self._lock = threading.Lock()
+        self.rounds = None
+        self.source = None
+        self.hash_ms = None
+        self.rehashed = 0
+
+    @property
+    def context(self) -> CryptContext:
+        if self._context is None:
+            self.calibrate()
+        return self._context
+
+    def calibrate(self) -> int:
+        with self._lock:
+            if self._context is not None:
+                return self.rounds
+
+            if self.fixed_rounds:
+                rounds, source = self.fixed_rounds, "env"
+            else:
+                rounds, source = self._measure_rounds(), "calibrated"
+
+            context = _bcrypt_context(rounds)
+            self.hash_ms = _time_hash(context)
+            self.rounds = rounds
+            self.source = source
+            self._context = context
+            return rounds
+
+    def _measure_rounds(self) -> int:
+        probe_rounds = max(self.min_rounds - 2, 4)
+        probe = _bcrypt_context(probe_rounds)
+        probe_ms = min(_time_hash(probe) for _ in range(3))
+
+        rounds = self.min_rounds
+        for candidate in range(self.min_rounds, self.max_rounds + 1):
+            if probe_ms * 2 ** (candidate - probe_rounds) <= self.target_ms:
+                rounds = candidate
+        return rounds
+
+    async def hash(self, password: str) -> str:
+        return await hash_pool.run(self.context.hash, password, op="bcrypt_hash")
+
+    async def verify(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """Balikin ``(cocok, hash_baru)``; ``hash_baru`` cuma diisi kalau cost hash lama beda."""
+        context = self.context
+        if not await hash_pool.run(context.verify, password, hashed, op="bcrypt_verify"):
+            return False, None
+        if not context.needs_update(hashed):
+            return True, None
+        new_hash = await hash_pool.run(context.hash, password, op="bcrypt_rehash")
+        self.rehashed += 1
+        return True, new_hash
+
+    def stats(self) -> dict:
+        return {
+            "rounds": self.rounds or 0,
+            "target_ms": self.target_ms,
+            "hash_ms": self.hash_ms or 0.0,
+            "calibrated": 1 if self.source == "calibrated" else 0,
+            "rehashed": self.rehashed,
+        }
+
+
+def _bcrypt_context(rounds: int) -> CryptContext:
+    # min/max desired sama dengan default: hash dengan cost lain -> needs_update
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_desired_rounds=rounds,
+        bcrypt__max_desired_rounds=rounds,
+    )
+
+
+def _time_hash(context: CryptContext) -> float:
+    started = time.perf_counter()
+    context.hash("calibration-probe")
+    return (time.perf_counter() - started) * 1000
+
+
+password_service = PasswordService(
+    target_ms=settings.BCRYPT_TARGET_MS,
+    rounds=settings.BCRYPT_ROUNDS,
+    min_rounds=settings.BCRYPT_MIN_ROUNDS,
+    max_rounds=settings.BCRYPT_MAX_ROUNDS,
+)
@@ -0,0 +1,124 @@
+import math
+import random
+import sqlite3
+import threading
+import time
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+
+class SQLiteRateLimiter:
+    """Token bucket yang state-nya di file SQLite (WAL), jadi dipakai bareng semua
+    worker di satu host tanpa service eksternal.
+
+    ``hit`` mengecek beberapa bucket sekaligus dalam satu transaksi
+    ``BEGIN IMMEDIATE``; token cuma dipotong kalau semua bucket masih ada sisa.
+    """
+
+    def __init__(self, path: str, cleanup_probability: float = 0.001):
+        self.path = path
+        self.cleanup_probability = cleanup_probability
+        self._local = threading.local()
+        self.allowed = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=2.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def hit(self, rules) -> float:
+        """``rules``: list of (key, capacity, refill_per_second).
+
+        Balikin 0 kalau boleh lanjut, atau berapa detik harus menunggu.
+        """
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            states = []
+            retry_after = 0.0
+            for key, capacity, rate in rules:
+                row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+                if tokens < 1:
+                    retry_after = max(retry_after, (1 - tokens) / rate)
+                states.append((key, tokens))
+
+            consume = 1 if retry_after == 0 else 0
+            conn.executemany(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                [(key, tokens - consume, now) for key, tokens in states],
+            )
+            if random.random() < self.cleanup_probability:
+                # bucket yang sudah lama penuh lagi tidak perlu disimpan
+                conn.execute("DELETE FROM buckets WHERE updated < ?", (now - 86400,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if retry_after:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    def stats(self) -> dict:
+        return {"allowed": self.allowed, "rejected": self.rejected, "errors": self.errors}
+
+
+rate_limiter = SQLiteRateLimiter(settings.RATE_LIMIT_DB_PATH)
+
+
+# pasangan (burst, per_minute) yang dipakai endpoint; dicek sekali saat startup
+BUCKET_SETTINGS = (
+    ("LOGIN_EMAIL_BURST", "LOGIN_EMAIL_PER_MINUTE"),
+    ("LOGIN_IP_BURST", "LOGIN_IP_PER_MINUTE"),
+    ("SET_PASS_BURST", "SET_PASS_PER_MINUTE"),
+)
+
+
+def validate_settings():
+    """Gagal di startup kalau ada limit < 1 (per_minute 0 = bucket tidak pernah terisi lagi)."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    for names in BUCKET_SETTINGS:
+        for name in names:
+            if getattr(settings, name) < 1:
+                raise ValueError(f"{name} must be at least 1, got {getattr(settings, name)}")
+
+
+def bucket(key: str, burst: int, per_minute: int):
+    return (key, burst, per_minute / 60.0)
+
+
+async def enforce_rate_limit(rules):
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    try:
+        retry_after = await run_in_threadpool(rate_limiter.hit, rules)
+    except sqlite3.OperationalError as e:
+        # file limiter ke-lock / rusak: fail open, login tetap jalan
+        rate_limiter.errors += 1
+        print("rate limit error:", e)
+        return
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
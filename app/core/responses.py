@@ -0,0 +1,22 @@
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse pakai orjson; jadi default_response_class seluruh app."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class PreEncodedJSONResponse(Response):
+    """Body JSON yang sudah di-encode sekali (bytes), tinggal dikirim."""
+
+    media_type = "application/json"
+
+
+def pre_encode(content) -> bytes:
+    return orjson.dumps(content)
+
+
+LOGGED_OUT_BODY = pre_encode({"message": "Logged Out"})
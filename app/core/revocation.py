@@ -0,0 +1,102 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.database import AsyncSessionLocal
+from app.models.revoked_session import RevokedSession
+
+
+class RevocationList:
+    """Denylist session id di memory buat mode ``AUTH_STATELESS``.
+
+    Pencabutan ditulis ke ``exordium_revoked_session`` di transaksi yang sama
+    dengan penghapusan sesinya, langsung berlaku di worker yang mencabut, dan
+    ditarik worker lain tiap ``sync_interval`` detik. Entry dibuang begitu
+    access token sesinya pasti sudah expired, jadi ukurannya cuma sebanyak sesi
+    yang dicabut dalam satu umur access token.
+
+    Kalau sync gagal lebih lama dari ``max_staleness`` detik, ``fresh`` jadi False
+    dan pemanggil harus balik cek sesi ke DB supaya batas delay tetap terjaga.
+    """
+
+    # commit yang telat dari revoked_at-nya masih kebaca di sync berikutnya
+    overlap = timedelta(seconds=60)
+
+    def __init__(self, sync_interval: float, batch_size: int = 1000):
+        self.sync_interval = sync_interval
+        self.max_staleness = sync_interval * 3
+        self.batch_size = batch_size
+        self._revoked: dict[str, datetime] = {}
+        self._watermark = None
+        self._synced_at = None
+        self.syncs = 0
+        self.sync_errors = 0
+
+    @property
+    def fresh(self) -> bool:
+        return self._synced_at is not None and time.monotonic() - self._synced_at <= self.max_staleness
+
+    def is_revoked(self, session_id: str) -> bool:
+        return session_id in self._revoked
+
+    def stage(self, db, session_ids, expires_at: datetime):
+        """Tambah baris pencabutan ke session ``db``; commit tetap di pemanggil."""
+        for session_id in session_ids:
+            db.add(RevokedSession(session_id=session_id, expires_at=expires_at))
+
+    def add(self, session_ids, expires_at: datetime):
+        for session_id in session_ids:
+            self._revoked[session_id] = expires_at
+
+    async def sync(self):
+        now = datetime.utcnow()
+        since = self._watermark - self.overlap if self._watermark is not None else None
+        last_id = 0
+        async with AsyncSessionLocal() as db:
+            while True:
+                stmt = (
+                    select(RevokedSession.id, RevokedSession.session_id, RevokedSession.expires_at, RevokedSession.revoked_at)
+                    .where(RevokedSession.expires_at > now, RevokedSession.id > last_id)
+                    .order_by(RevokedSession.id)
+                    .limit(self.batch_size)
+                )
+                if since is not None:
+                    stmt = stmt.where(RevokedSession.revoked_at >= since)
+                rows = (await db.execute(stmt)).all()
+                for row in rows:
+                    self._revoked[row.session_id] = row.expires_at
+                    if row.revoked_at is not None and (self._watermark is None or row.revoked_at > self._watermark):
+                        self._watermark = row.revoked_at
+                if len(rows) < self.batch_size:
+                    break
+                last_id = rows[-1].id
+
+        for session_id in [sid for sid, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[session_id]
+        self._synced_at = time.monotonic()
+        self.syncs += 1
+
+    async def run_forever(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.sync_errors += 1
+                print("revocation sync error:", e)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._revoked),
+            "syncs": self.syncs,
+            "sync_errors": self.sync_errors,
+            "fresh": 1 if self.fresh else 0,
+        }
+
+
+revocation_list = RevocationList(sync_interval=settings.REVOCATION_SYNC_SECONDS)
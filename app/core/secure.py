@@ -1,52 +1,86 @@
 # app/core/security.py
 from datetime import datetime, timedelta
-from fastapi import Request, HTTPException, Depends
-from sqlalchemy.orm import Session
-from jose import jwt, JWTError
+from fastapi import Request, HTTPException
 from datetime import datetime
 from app.config import settings
-from app.models.database import get_db
-from app.models.user import User
-from app.models.refresh_token import UserRefreshToken
+from app.models.database import AsyncSessionLocal
+from app.core.session_cache import session_cache, UserSnapshot
+from app.core.revocation import revocation_list
+from app.core import metrics
+from app.core.token_backend import token_backend, TokenError
+from app.api.crud import get_session_user_snapshot
+from app.helper.activity_buffer import activity_buffer
 
+import hashlib
 import uuid
 
-def get_current_user_from_cookie(request: Request, db: Session = Depends(get_db)):
+async def get_current_user_from_cookie(request: Request):
+    user = await _authenticate(request)
+    # last_seen_at: cuma masuk buffer di memory, ditulis batch di background
+    activity_buffer.record_seen(user.id)
+    return user
+
+async def _authenticate(request: Request) -> UserSnapshot:
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+        with metrics.timed("jwt_decode"):
+            payload = token_backend.decode(token)
         user_id = payload.get("sub")
         session_id = payload.get("session_id")
         
         if not user_id or not session_id :
             raise HTTPException(status_code=401, detail="Invalid token")
         
-    except JWTError:
+    except TokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    curr_session = db.query(UserRefreshToken).filter_by(user_id=user_id, session_id=session_id).first()
-    if not curr_session:
+    # mode stateless: profil diambil dari claim, cukup cek denylist pencabutan.
+    # Kalau denylist ketinggalan sync (atau token lama tanpa claim), cek ke DB.
+    if settings.AUTH_STATELESS and "email" in payload and revocation_list.fresh:
+        if revocation_list.is_revoked(session_id):
+            raise HTTPException(status_code=401, detail="Session invalid or expired")
+        return UserSnapshot(
+            id=int(user_id),
+            email=payload["email"],
+            name=payload.get("name"),
+            pict_uri=payload.get("pict_uri"),
+        )
+
+    cached = session_cache.get(user_id, session_id)
+    if cached is not None:
+        return cached
+
+    generation = session_cache.generation
+    # validitas sesi selalu dicek ke primary: replica yang ketinggalan bisa
+    # masih punya sesi yang sudah logout / di-evict, lalu ke-cache sampai TTL
+    async with AsyncSessionLocal() as db:
+        snapshot = await get_session_user_snapshot(db, int(user_id), session_id)
+    if snapshot is None:
         raise HTTPException(status_code=401, detail="Session invalid or expired")
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
+    session_cache.set(user_id, session_id, snapshot, generation=generation)
+    return snapshot
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(days=7))
     jti = str(uuid.uuid4())
     to_encode.update({"exp": expire, "jti":jti})
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
+    with metrics.timed("jwt_encode"):
+        encoded_jwt = token_backend.encode(to_encode)
     return encoded_jwt, jti
 
 def create_refresh_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(days=30))
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
+    # jti bikin token hasil rotasi selalu beda walau di detik yang sama
+    to_encode.update({"exp": expire, "type": "refresh", "jti": str(uuid.uuid4())})
+    with metrics.timed("jwt_encode"):
+        encoded_jwt = token_backend.encode(to_encode)
     return encoded_jwt
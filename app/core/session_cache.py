@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    id: int
+    email: str
+    name: str | None = None
+    pict_uri: str | None = None
+
+
+class SessionCache:
+    """Bounded TTL + LRU cache of validated (user_id, session_id) -> UserSnapshot.
+
+    Cache ini per-proses; invalidasi eksplisit cuma berlaku di worker yang sama,
+    worker lain bergantung ke TTL jadi TTL harus tetap pendek.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[float, UserSnapshot]] = OrderedDict()
+        self._by_user: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id, session_id: str) -> UserSnapshot | None:
+        key = (str(user_id), session_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return snapshot
+
+    def set(self, user_id, session_id: str, snapshot: UserSnapshot, generation: int | None = None):
+        # kalau ada invalidasi selama query berjalan, hasilnya bisa sudah basi
+        key = (str(user_id), session_id)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(key)
+            self._by_user.setdefault(key[0], set()).add(session_id)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, user_id, session_id: str):
+        key = (str(user_id), session_id)
+        with self._lock:
+            self._generation += 1
+            if key in self._entries:
+                self._remove(key)
+                self.invalidations += 1
+
+    def invalidate_user(self, user_id):
+        user_key = str(user_id)
+        with self._lock:
+            self._generation += 1
+            for session_id in list(self._by_user.get(user_key, ())):
+                self._remove((user_key, session_id))
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: tuple[str, str]):
+        self._entries.pop(key, None)
+        sessions = self._by_user.get(key[0])
+        if sessions is not None:
+            sessions.discard(key[1])
+            if not sessions:
+                del self._by_user[key[0]]
+
+
+session_cache = SessionCache(
+    max_size=settings.SESSION_CACHE_MAX_SIZE,
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,130 @@
+"""Tanda tangan + verifikasi JWT milik API ini (access & refresh token).
+
+Backend dipilih dari ``ALGORITHM``:
+
+* ``HS256``/``HS384``/``HS512`` -> ``HMACBackend`` dengan ``JWT_SECRET_KEY``.
+* ``ES256`` / ``EdDSA`` -> ``AsymmetricBackend`` dengan private key PEM di
+  ``JWT_PRIVATE_KEY_FILE``; public key-nya dipublikasikan di
+  ``/.well-known/jwks.json`` supaya service lain bisa verifikasi access token
+  sendiri tanpa nanya ke API ini.
+
+Key di-parse sekali saat startup lalu objeknya dipakai ulang (pyjwt). Error dari
+library dibungkus jadi ``TokenError`` / ``ExpiredTokenError``.
+"""
+import base64
+import hashlib
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from app.config import settings
+
+
+class TokenError(Exception):
+    """Token tidak valid (signature, format, claim)."""
+
+
+class ExpiredTokenError(TokenError):
+    pass
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+class TokenBackend:
+    algorithm: str
+    kid: str | None = None
+
+    def __init__(self, signing_key, verifying_key):
+        self._signing_key = signing_key
+        self._verifying_key = verifying_key
+        self._headers = {"kid": self.kid} if self.kid else None
+
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self._signing_key, algorithm=self.algorithm, headers=self._headers)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return jwt.decode(token, self._verifying_key, algorithms=[self.algorithm])
+        except jwt.ExpiredSignatureError as e:
+            raise ExpiredTokenError(str(e)) from e
+        except jwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+
+    @staticmethod
+    def unverified_claims(token: str) -> dict:
+        """Claims tanpa cek signature/exp; jangan dipakai buat keputusan auth."""
+        try:
+            return jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+
+    def jwks(self) -> dict:
+        return {"keys": []}
+
+
+class HMACBackend(TokenBackend):
+    def __init__(self, secret: str, algorithm: str = "HS256"):
+        self.algorithm = algorithm
+        key = secret.encode("utf-8") if isinstance(secret, str) else secret
+        super().__init__(key, key)
+
+
+class AsymmetricBackend(TokenBackend):
+    def __init__(self, private_pem: bytes, algorithm: str, kid: str | None = None):
+        private_key = serialization.load_pem_private_key(private_pem, password=None)
+        if algorithm == "ES256" and not (
+            isinstance(private_key, ec.EllipticCurvePrivateKey) and private_key.curve.name == "secp256r1"
+        ):
+            raise ValueError("ES256 needs a P-256 private key")
+        if algorithm == "EdDSA" and not isinstance(private_key, ed25519.Ed25519PrivateKey):
+            raise ValueError("EdDSA needs an Ed25519 private key")
+
+        self.algorithm = algorithm
+        public_key = private_key.public_key()
+        self._jwk = self._public_jwk(public_key)
+        # default kid: thumbprint public key, jadi berubah otomatis kalau key diganti
+        self.kid = kid or _b64url(hashlib.sha256(public_key.public_bytes(
+            serialization.Encoding.DER,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )).digest()[:12])
+        self._jwk.update({"kid": self.kid, "alg": algorithm, "use": "sig"})
+        super().__init__(private_key, public_key)
+
+    @staticmethod
+    def _public_jwk(public_key) -> dict:
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+            return {"kty": "OKP", "crv": "Ed25519", "x": _b64url(raw)}
+        numbers = public_key.public_numbers()
+        return {
+            "kty": "EC",
+            "crv": "P-256",
+            "x": _b64url(numbers.x.to_bytes(32, "big")),
+            "y": _b64url(numbers.y.to_bytes(32, "big")),
+        }
+
+    def jwks(self) -> dict:
+        return {"keys": [self._jwk]}
+
+
+def create_backend(algorithm: str | None, secret: str | None, private_key_file: str | None, kid: str | None = None) -> TokenBackend:
+    algorithm = algorithm or "HS256"
+    if algorithm.startswith("HS"):
+        return HMACBackend(secret, algorithm)
+    if algorithm in ("ES256", "EdDSA"):
+        if not private_key_file:
+            raise RuntimeError(f"JWT_PRIVATE_KEY_FILE is required for ALGORITHM={algorithm}")
+        with open(private_key_file, "rb") as f:
+            return AsymmetricBackend(f.read(), algorithm, kid=kid)
+    raise RuntimeError(f"Unsupported JWT ALGORITHM {algorithm!r}")
+
+
+token_backend = create_backend(
+    settings.ALGORITHM,
+    settings.JWT_SECRET_KEY,
+    settings.JWT_PRIVATE_KEY_FILE,
+    kid=settings.JWT_KEY_ID,
+)
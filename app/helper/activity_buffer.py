@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import bindparam, or_, update
+
+from app.config import settings
+from app.models.database import async_engine
+from app.models.user import User
+
+
+class ActivityBuffer:
+    """Write-behind buat ``last_login_at`` / ``last_seen_at`` user.
+
+    Request cuma menulis timestamp ke dict di memory (user yang sama cukup satu
+    entry, yang terbaru menang). Tiap ``flush_interval`` detik, atau lebih cepat
+    kalau entry sudah ``max_pending``, isinya ditulis pakai satu UPDATE
+    executemany per kolom. Saat shutdown buffer di-flush terakhir kali; kalau
+    proses mati mendadak, aktivitas beberapa detik terakhir hilang.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._logins: dict[int, datetime] = {}
+        self._seen: dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._flushing = asyncio.Lock()
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_errors = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._logins) + len(self._seen)
+
+    def record_login(self, user_id: int, at: datetime | None = None):
+        at = at or datetime.utcnow()
+        self._logins[int(user_id)] = at
+        self.record_seen(user_id, at)
+
+    def record_seen(self, user_id: int, at: datetime | None = None):
+        self._seen[int(user_id)] = at or datetime.utcnow()
+        if len(self._seen) >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        async with self._flushing:
+            logins, self._logins = self._logins, {}
+            seen, self._seen = self._seen, {}
+            if not logins and not seen:
+                return 0
+            try:
+                async with async_engine.begin() as conn:
+                    for column, pending in (("last_login_at", logins), ("last_seen_at", seen)):
+                        if pending:
+                            await conn.execute(_update_statement(column), [
+                                {"user_id": user_id, "ts": at} for user_id, at in pending.items()
+                            ])
+            except BaseException:
+                # gagal / di-cancel saat shutdown: balikin ke buffer;
+                # timestamp yang lebih baru (masuk selama flush) tetap menang
+                self.flush_errors += 1
+                for target, pending in ((self._logins, logins), (self._seen, seen)):
+                    for user_id, at in pending.items():
+                        if target.get(user_id, at) <= at:
+                            target[user_id] = at
+                raise
+
+            written = len(logins) + len(seen)
+            self.flushes += 1
+            self.rows_written += written
+            return written
+
+    async def run_forever(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("activity flush error:", e)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "flush_errors": self.flush_errors,
+        }
+
+
+def _update_statement(column: str):
+    # WHERE kolom lebih lama: worker lain yang flush timestamp lebih baru tidak ketimpa
+    table = User.__table__
+    target = table.c[column]
+    return (
+        update(table)
+        .where(table.c.id == bindparam("user_id"), or_(target.is_(None), target < bindparam("ts")))
+        .values({column: bindparam("ts")})
+    )
+
+
+activity_buffer = ActivityBuffer(
+    flush_interval=settings.ACTIVITY_FLUSH_SECONDS,
+    max_pending=settings.ACTIVITY_BUFFER_MAX,
+)
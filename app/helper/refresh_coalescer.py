@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from app.config import settings
+from app.core.secure import hash_token
+from app.helper.token_service import TokenService
+from app.models.database import AsyncSessionLocal
+
+
+class RefreshCoalescer:
+    """Single-flight buat ``/auth/refresh`` per refresh token.
+
+    Beberapa tab yang refresh bareng pakai cookie yang sama: request pertama
+    menjalankan rotasi (satu UPDATE), sisanya menunggu hasil yang sama. Setelah
+    itu pasangan token baru disimpan ``grace_seconds`` dengan key hash token
+    lama, jadi tab yang telat datang dengan token lama tetap dapat pasangan yang
+    sama, bukan 401.
+
+    State-nya per worker: request yang jatuh ke worker lain di dalam grace
+    window tetap ditolak seperti biasa.
+    """
+
+    def __init__(self, grace_seconds: float, max_entries: int = 10000):
+        self.grace_seconds = grace_seconds
+        self.max_entries = max_entries
+        self._inflight: dict[str, asyncio.Task] = {}
+        # hash token lama -> (expire monotonic, session_id, hasil rotate_tokens)
+        self._grace: dict[str, tuple[float, str, tuple]] = {}
+        self.rotations = 0
+        self.coalesced = 0
+        self.grace_hits = 0
+
+    async def rotate(self, user_id, session_id: str, presented_token: str):
+        key = hash_token(presented_token)
+        entry = self._grace.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.grace_hits += 1
+                return entry[2]
+            del self._grace[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._rotate(key, user_id, session_id, presented_token))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: request yang putus tidak membatalkan rotasi yang ditunggu tab lain
+        return await asyncio.shield(task)
+
+    async def _rotate(self, key: str, user_id, session_id: str, presented_token: str):
+        # session DB sendiri, tidak ikut ditutup kalau request pemicunya selesai duluan
+        async with AsyncSessionLocal() as db:
+            tokens = await TokenService(db).rotate_tokens(user_id, session_id, presented_token)
+        self.rotations += 1
+        if tokens is not None and self.grace_seconds > 0:
+            self._remember(key, session_id, tokens)
+        return tokens
+
+    def _remember(self, key: str, session_id: str, tokens: tuple):
+        now = time.monotonic()
+        if len(self._grace) >= self.max_entries:
+            for stale in [k for k, (expires, _, _) in self._grace.items() if expires <= now]:
+                del self._grace[stale]
+            while len(self._grace) >= self.max_entries:
+                del self._grace[next(iter(self._grace))]
+        self._grace[key] = (now + self.grace_seconds, session_id, tokens)
+
+    def forget_session(self, session_id: str):
+        """Dipanggil saat logout supaya token lama tidak bisa dipakai lewat grace window."""
+        for key in [k for k, (_, sid, _) in self._grace.items() if sid == session_id]:
+            del self._grace[key]
+
+    def stats(self) -> dict:
+        return {
+            "rotations": self.rotations,
+            "coalesced": self.coalesced,
+            "grace_hits": self.grace_hits,
+            "grace_entries": len(self._grace),
+        }
+
+
+refresh_coalescer = RefreshCoalescer(grace_seconds=settings.REFRESH_GRACE_SECONDS)
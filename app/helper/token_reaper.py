@@ -0,0 +1,122 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.models.database import AsyncSessionLocal
+from app.models.job_lease import JobLease
+from app.models.refresh_token import UserRefreshToken
+from app.models.revoked_session import RevokedSession
+
+
+class TokenReaper:
+    """Background job yang menghapus refresh token/sesi (dan pencabutan sesi) yang sudah expired.
+
+    Hapus per batch kecil dengan jeda antar batch supaya tidak pegang lock lama.
+    Kalau ada beberapa worker, cuma pemegang lease di ``exordium_job_lease``
+    yang jalan; lease diperpanjang tiap batch dan otomatis lepas kalau worker mati.
+    """
+
+    lease_name = "refresh_token_reaper"
+
+    def __init__(self, interval: float, batch_size: int, batch_pause: float, lease_seconds: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.runs = 0
+        self.total_removed = 0
+        self.last_removed = 0
+        self.last_run_at = None
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("token reaper error:", e)
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> int:
+        if not await self.acquire_lease():
+            return 0
+
+        removed = 0
+        for model in (UserRefreshToken, RevokedSession):
+            while True:
+                now = datetime.utcnow()
+                async with AsyncSessionLocal() as db:
+                    ids = (await db.execute(
+                        select(model.id)
+                        .where(model.expires_at < now)
+                        .limit(self.batch_size)
+                    )).scalars().all()
+                    if ids:
+                        await db.execute(delete(model).where(model.id.in_(ids)))
+                        await db.commit()
+                removed += len(ids)
+                if len(ids) < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_pause)
+                if not await self.acquire_lease():
+                    return self._finish(removed)
+
+        return self._finish(removed)
+
+    def _finish(self, removed: int) -> int:
+        self.runs += 1
+        self.total_removed += removed
+        self.last_removed = removed
+        self.last_run_at = datetime.utcnow()
+        if removed:
+            print(f"token reaper: removed {removed} expired refresh tokens / revocations")
+        return removed
+
+    async def acquire_lease(self) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(JobLease)
+                .where(
+                    JobLease.name == self.lease_name,
+                    or_(JobLease.owner == self.owner, JobLease.expires_at < now),
+                )
+                .values(owner=self.owner, expires_at=expires_at)
+            )
+            if result.rowcount == 1:
+                await db.commit()
+                return True
+
+            # baris lease belum ada, atau masih dipegang worker lain
+            db.add(JobLease(name=self.lease_name, owner=self.owner, expires_at=expires_at))
+            try:
+                await db.commit()
+                return True
+            except IntegrityError:
+                await db.rollback()
+                return False
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "total_removed": self.total_removed,
+            "last_removed": self.last_removed,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+token_reaper = TokenReaper(
+    interval=settings.TOKEN_REAPER_INTERVAL_SECONDS,
+    batch_size=settings.TOKEN_REAPER_BATCH_SIZE,
+    batch_pause=settings.TOKEN_REAPER_BATCH_PAUSE_SECONDS,
+    lease_seconds=settings.TOKEN_REAPER_LEASE_SECONDS,
+)
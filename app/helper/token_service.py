@@ -1,39 +1,112 @@
 from datetime import datetime, timedelta
 from fastapi.responses import JSONResponse
-from jose import jwt
+from sqlalchemy import delete, select, update
 import uuid
 import secrets
 from app.config import settings
 from app.models.refresh_token import UserRefreshToken
-from app.core.secure import create_access_token, create_refresh_token
+from app.models.user import User
+from app.core.secure import create_access_token, create_refresh_token, hash_token
+from app.core.session_cache import session_cache, UserSnapshot
+from app.core.revocation import revocation_list
+from app.api.crud import get_user_snapshot
 
 class TokenService:
     def __init__(self, db):
         self.db = db
 
-    def generate_tokens(self, user_id: int):
+    access_token_expires = timedelta(days=1)
+    refresh_token_expires = timedelta(days=30)
+
+    async def generate_tokens(self, user_id: int, profile: UserSnapshot | None = None):
+        """Login baru: bikin sesi baru dalam satu transaksi.
+
+        Sesi lama user di atas ``MAX_SESSIONS_PER_USER`` dibuang (paling lama dulu).
+        Di mode ``AUTH_STATELESS`` sesi yang dibuang juga dicabut lewat denylist,
+        dan ``profile`` (kalau tidak dikirim, diambil dari DB) masuk ke access token.
+        """
+        user_id = int(user_id)
         session_id = str(uuid.uuid4())
-        
-        access_token_expires = timedelta(days=1)
-        refresh_token_expires = timedelta(days=30)
-        
-        self.db.query(UserRefreshToken).filter(UserRefreshToken.user_id == user_id).delete()
-        self.db.commit()
+        if settings.AUTH_STATELESS and profile is None:
+            profile = await get_user_snapshot(self.db, user_id)
+        access_token, refresh_token = self._issue(user_id, session_id, profile)
+        max_sessions = max(settings.MAX_SESSIONS_PER_USER, 1)
 
-        access_token, access_jti = create_access_token({"sub": str(user_id), "session_id": session_id}, expires_delta=access_token_expires)
-        refresh_token = create_refresh_token({"sub": str(user_id), "session_id": session_id}, expires_delta=refresh_token_expires)
+        # kunci baris user dulu: login paralel user yang sama antri di sini, jadi
+        # hitung + buang sesi tidak balapan (termasuk user yang belum punya sesi,
+        # yang tidak punya baris token untuk dikunci). UPDATE tanpa perubahan,
+        # bukan SELECT ... FOR UPDATE: di SQLite FOR UPDATE diabaikan, UPDATE
+        # tetap ambil write lock; di MySQL sama-sama row lock dan tidak ada yang ditulis.
+        await self.db.execute(update(User).where(User.id == user_id).values(id=User.id))
+        # FOR UPDATE juga di sini: di InnoDB REPEATABLE READ, SELECT biasa membaca
+        # snapshot dari query pertama transaksi (mis. SELECT user di login), jadi
+        # sesi yang baru di-commit login lain tidak kelihatan. Locking read
+        # selalu membaca versi terbaru yang sudah di-commit.
+        result = await self.db.execute(
+            select(UserRefreshToken.id, UserRefreshToken.session_id)
+            .where(UserRefreshToken.user_id == user_id)
+            .order_by(UserRefreshToken.created_at.desc(), UserRefreshToken.id.desc())
+            .with_for_update()
+        )
+        evicted = result.all()[max_sessions - 1:]
+        if evicted:
+            await self.db.execute(
+                delete(UserRefreshToken).where(UserRefreshToken.id.in_([row.id for row in evicted]))
+            )
 
-        db_token = UserRefreshToken(
+        now = datetime.utcnow()
+        revoked = [row.session_id for row in evicted] if settings.AUTH_STATELESS and evicted else []
+        if revoked:
+            revocation_list.stage(self.db, revoked, now + self.access_token_expires)
+        self.db.add(UserRefreshToken(
             user_id=user_id,
-            token=refresh_token,
+            token_hash=hash_token(refresh_token),
             session_id=session_id,
-            expires_at=datetime.utcnow() + refresh_token_expires,
-            created_at=datetime.utcnow().replace(microsecond=0)
+            expires_at=now + self.refresh_token_expires,
+            created_at=now.replace(microsecond=0)
+        ))
+        await self.db.commit()
+        if revoked:
+            revocation_list.add(revoked, now + self.access_token_expires)
+
+        for row in evicted:
+            session_cache.invalidate(user_id, row.session_id)
+
+        return access_token, refresh_token, self.access_token_expires, self.refresh_token_expires
+
+    async def rotate_tokens(self, user_id: int, session_id: str, presented_token: str):
+        """Refresh: ganti token di baris sesi yang sama (satu UPDATE, satu commit).
+
+        Balikin None kalau token yang dikirim sudah tidak cocok (sudah di-rotate
+        request lain, logout, atau di-evict).
+        """
+        user_id = int(user_id)
+        profile = await get_user_snapshot(self.db, user_id) if settings.AUTH_STATELESS else None
+        access_token, refresh_token = self._issue(user_id, session_id, profile)
+        result = await self.db.execute(
+            update(UserRefreshToken)
+            .where(
+                UserRefreshToken.user_id == user_id,
+                UserRefreshToken.session_id == session_id,
+                UserRefreshToken.token_hash == hash_token(presented_token),
+            )
+            .values(token_hash=hash_token(refresh_token), expires_at=datetime.utcnow() + self.refresh_token_expires)
         )
-        self.db.add(db_token)
-        self.db.commit()
+        if result.rowcount != 1:
+            await self.db.rollback()
+            return None
+        await self.db.commit()
+
+        return access_token, refresh_token, self.access_token_expires, self.refresh_token_expires
 
-        return access_token, refresh_token, access_token_expires, refresh_token_expires
+    def _issue(self, user_id: int, session_id: str, profile: UserSnapshot | None = None):
+        claims = {"sub": str(user_id), "session_id": session_id}
+        access_claims = claims
+        if profile is not None:
+            access_claims = {**claims, "email": profile.email, "name": profile.name, "pict_uri": profile.pict_uri}
+        access_token, access_jti = create_access_token(access_claims, expires_delta=self.access_token_expires)
+        refresh_token = create_refresh_token(claims, expires_delta=self.refresh_token_expires)
+        return access_token, refresh_token
 
     def set_auth_cookies(self, response: JSONResponse, access_token: str, refresh_token: str, access_exp: timedelta, refresh_exp: timedelta):
         response.set_cookie(
@@ -1,10 +1,61 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.models.database import init_db
-from fastapi.middleware.cors import CORSMiddleware
-from app.middlewares.csrf_middleware import CSRFMiddleware
-from app.routers import auth, user, data
+from app.config import settings
+from app.models.database import init_db, engine, async_engine
+from app.models import routing
+from app.core import metrics
+from app.core.session_cache import session_cache
+from app.core.crypto import key_ring
+from app.core.hash_pool import hash_pool
+from app.core.passwords import password_service
+from app.core.http_client import http_client
+from app.core.rate_limit import rate_limiter, validate_settings as validate_rate_limits
+from app.core.revocation import revocation_list
+from app.helper.token_reaper import token_reaper
+from app.helper.refresh_coalescer import refresh_coalescer
+from app.helper.activity_buffer import activity_buffer
+from app.core.responses import FastJSONResponse
+from app.middlewares.csrf_middleware import CORSCSRFMiddleware
+from app.middlewares.metrics_middleware import MetricsMiddleware
+from app.routers import auth, user, data, well_known, metrics as metrics_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    validate_rate_limits()
+    init_db()
+    key_ring.load()
+    password_service.calibrate()
+    await http_client.start()
+
+    background_tasks = [asyncio.create_task(activity_buffer.run_forever())]
+    if settings.TOKEN_REAPER_ENABLED:
+        background_tasks.append(asyncio.create_task(token_reaper.run_forever()))
+    if routing.replicas.engines:
+        background_tasks.append(asyncio.create_task(routing.run_health_checks()))
+    if settings.AUTH_STATELESS:
+        try:
+            await revocation_list.sync()
+        except Exception as e:
+            # belum fresh -> auth otomatis balik cek sesi ke DB sampai sync berhasil
+            print("revocation sync error:", e)
+        background_tasks.append(asyncio.create_task(revocation_list.run_forever()))
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        try:
+            await activity_buffer.flush()
+        except Exception as e:
+            print("activity flush error:", e)
+        await http_client.close()
+        hash_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 origins = [
     "http://localhost:5173",
     "http://exordium.id",
@@ -12,19 +63,29 @@ origins = [
 ]
 
 app.add_middleware(
-    CORSMiddleware,
+    CORSCSRFMiddleware,
     allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    max_age=settings.CORS_MAX_AGE,
 )
-app.add_middleware(CSRFMiddleware)
-
+app.add_middleware(MetricsMiddleware)
 
-@app.on_event("startup")
-def on_startup():
-    init_db()
+metrics.instrument_engine(engine, "sync")
+metrics.instrument_engine(async_engine, "async")
+for i, replica in enumerate(routing.replicas.engines):
+    metrics.instrument_engine(replica, f"replica{i}")
+metrics.register_collector("hash_pool", hash_pool.stats)
+metrics.register_collector("passwords", password_service.stats)
+metrics.register_collector("session_cache", session_cache.stats)
+metrics.register_collector("http_client", http_client.stats)
+metrics.register_collector("token_reaper", token_reaper.stats)
+metrics.register_collector("refresh", refresh_coalescer.stats)
+metrics.register_collector("rate_limit", rate_limiter.stats)
+metrics.register_collector("revocation", revocation_list.stats)
+metrics.register_collector("db_routing", routing.stats)
+metrics.register_collector("activity", activity_buffer.stats)
 
 app.include_router(user.router)
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(data.router, prefix="/data", tags=["data"])
+app.include_router(well_known.router)
+app.include_router(metrics_router.router)
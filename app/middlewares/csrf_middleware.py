@@ -1,36 +1,129 @@
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi.responses import JSONResponse
-
-class CSRFMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if request.method == "OPTIONS":
-            origin = request.headers.get("origin")
-            return JSONResponse(
-                status_code=200,
-                content={},
-                headers={
-                    "Access-Control-Allow-Origin": origin or "*",
-                    "Access-Control-Allow-Credentials": "true",
-                    "Access-Control-Allow-Headers": "Content-Type, X-CSRF-TOKEN, x-requested-with",
-                    "Access-Control-Allow-Methods": "GET, POST, PUT, PATCH, DELETE, OPTIONS",
-                }
+from starlette.requests import cookie_parser
+from app.core.responses import pre_encode
+
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+CSRF_FAILED_BODY = pre_encode({"detail": "Your CSRF is not valid"})
+CORS_DENIED_BODY = b"Disallowed CORS origin"
+
+
+class CORSCSRFMiddleware:
+    """CORS + CSRF (double-submit cookie) dalam satu middleware ASGI murni.
+
+    Pengganti CORSMiddleware + CSRFMiddleware (BaseHTTPMiddleware) yang lama:
+    tanpa task/stream wrapper tambahan per request, header dibaca sekali dari
+    scope, dan preflight dijawab dengan ``Access-Control-Max-Age`` supaya
+    browser tidak preflight terus.
+    """
+
+    def __init__(
+        self,
+        app,
+        allow_origins,
+        allow_methods=("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"),
+        allow_headers=("Content-Type", "X-CSRF-TOKEN", "x-requested-with"),
+        max_age: int = 86400,
+        csrf_exempt_prefixes=("/auth",),
+        csrf_protected_paths=("/data/data",),
+        expose_headers=("X-Next-Cursor",),
+    ):
+        self.app = app
+        self.allow_origins = frozenset(allow_origins)
+        # header response yang boleh dibaca JS cross-origin (cursor pagination /users)
+        self.cors_headers = [(b"access-control-allow-credentials", b"true")]
+        if expose_headers:
+            self.cors_headers.append(
+                (b"access-control-expose-headers", ", ".join(expose_headers).encode("latin-1"))
             )
-            
-        if request.url.path.startswith("/auth"):
-            return await call_next(request)
-        
-        ngetest_doang = ['/data/data']
-        
-        if request.method in ("POST", "PUT", "PATCH", "DELETE") or request.url.path in ngetest_doang:
-            csrf_cookie = request.cookies.get("XSRF-TOKEN")
-            csrf_header = request.headers.get("X-CSRF-TOKEN")
-
-            if not csrf_cookie or not csrf_header or csrf_cookie != csrf_header:
-                return JSONResponse(
-                    status_code=403,
-                    content={"detail": "Your CSRF is not valid"},
-                )
-        response = await call_next(request)
-        return response
+        self.csrf_exempt_prefixes = tuple(csrf_exempt_prefixes)
+        # path yang dicek CSRF juga untuk GET/HEAD
+        self.csrf_protected_paths = frozenset(csrf_protected_paths)
+        self.preflight_headers = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-allow-headers", ", ".join(allow_headers).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"vary", b"Origin"),
+            (b"content-length", b"0"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = cookie_header = csrf_header = preflight_method = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"cookie":
+                cookie_header = value
+            elif name == b"x-csrf-token":
+                csrf_header = value
+            elif name == b"access-control-request-method":
+                preflight_method = value
+
+        method = scope["method"]
+        allowed_origin = origin if origin is not None and origin.decode("latin-1") in self.allow_origins else None
+
+        if method == "OPTIONS" and origin is not None and preflight_method is not None:
+            if allowed_origin is None:
+                await _respond(send, 400, CORS_DENIED_BODY, [(b"content-type", b"text/plain; charset=utf-8")])
+                return
+            await _respond(send, 204, b"", [(b"access-control-allow-origin", allowed_origin)] + self.preflight_headers)
+            return
+
+        if allowed_origin is not None:
+            send = _with_cors_headers(send, allowed_origin, self.cors_headers)
+
+        # OPTIONS (termasuk yang bukan preflight) tidak pernah dicek CSRF;
+        # GET/HEAD cuma di csrf_protected_paths
+        path = scope["path"]
+        if (
+            method != "OPTIONS"
+            and not path.startswith(self.csrf_exempt_prefixes)
+            and (method in UNSAFE_METHODS or path in self.csrf_protected_paths)
+        ):
+            csrf_cookie = None
+            if cookie_header is not None:
+                csrf_cookie = cookie_parser(cookie_header.decode("latin-1")).get("XSRF-TOKEN")
+            if not csrf_cookie or csrf_header is None or csrf_cookie != csrf_header.decode("latin-1"):
+                await _respond(send, 403, CSRF_FAILED_BODY, [(b"content-type", b"application/json")])
+                return
+
+        await self.app(scope, receive, send)
+
+
+def _with_cors_headers(send, origin: bytes, cors_headers):
+    async def send_with_cors(message):
+        if message["type"] == "http.response.start":
+            headers = []
+            vary = None
+            for name, value in message.get("headers", ()):
+                if name.lower() == b"vary":
+                    vary = value if vary is None else vary + b", " + value
+                else:
+                    headers.append((name, value))
+            headers.append((b"access-control-allow-origin", origin))
+            headers.extend(cors_headers)
+            headers.append((b"vary", _merge_vary(vary)))
+            message = {**message, "headers": headers}
+        await send(message)
+
+    return send_with_cors
+
+
+def _merge_vary(vary: bytes | None) -> bytes:
+    # satu header Vary: gabung ke yang sudah diset route (mis. Accept-Encoding)
+    if not vary:
+        return b"Origin"
+    tokens = [token.strip() for token in vary.split(b",")]
+    if b"*" in tokens or any(token.lower() == b"origin" for token in tokens):
+        return vary
+    return vary + b", Origin"
+
 
+async def _respond(send, status: int, body: bytes, headers):
+    if body:
+        headers = headers + [(b"content-length", str(len(body)).encode("latin-1"))]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,39 @@
+import time
+
+from app.core import metrics
+
+
+class MetricsMiddleware:
+    """Catat latency, status dan statement SQL per route (template path, bukan URL asli)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats, reset_token = metrics.start_request()
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # router FastAPI menaruh route yang match di scope
+            route = scope.get("route")
+            metrics.finish_request(
+                stats,
+                reset_token,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - started,
+            )
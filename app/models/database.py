@@ -1,21 +1,41 @@
+import ssl
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.config import settings
 
 Base = declarative_base()
 
 connect_args = {}
+async_connect_args = {}
 if settings.DB_SSL_CA:
     connect_args = {"ssl_ca": settings.DB_SSL_CA}
+    async_connect_args = {"ssl": ssl.create_default_context(cafile=settings.DB_SSL_CA)}
+
+# budget koneksi per worker (lihat run.py); 0 = default SQLAlchemy
+pool_args = {}
+if settings.DB_POOL_SIZE:
+    pool_args = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
 
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URL,
     pool_pre_ping=True,
-    connect_args=connect_args
+    connect_args=connect_args,
+    **pool_args
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine async buat route `async def` (controller auth), supaya query tidak nge-block event loop
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    connect_args=async_connect_args,
+    **pool_args
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Dependency untuk FastAPI
 def get_db():
     db = SessionLocal()
@@ -24,6 +44,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
-    from app.models import user 
+    from app.models import user, user_privacy, refresh_token, job_lease, revoked_session  # noqa: F401
     Base.metadata.create_all(bind=engine)
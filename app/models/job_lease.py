@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, DateTime
+from app.models.database import Base
+
+class JobLease(Base):
+    """Satu baris per background job; worker yang pegang lease yang boleh jalan."""
+    __tablename__ = "exordium_job_lease"
+
+    name = Column(String(64), primary_key=True)
+    owner = Column(String(128), nullable=True)
+    expires_at = Column(DateTime, nullable=False)
@@ -0,0 +1,81 @@
+"""Migrasi exordium_user_refresh_token dari kolom ``token`` (JWT utuh, VARCHAR(512)
+unique) ke ``token_hash`` (SHA-256 hex, CHAR(64)) plus index baru.
+
+    python -m app.models.migrate_refresh_tokens
+
+Jalankan saat app versi lama sudah berhenti: versi lama masih nulis ``token``,
+versi baru cuma nulis ``token_hash``. Aman dijalankan berulang kali.
+"""
+import argparse
+
+from sqlalchemy import bindparam, inspect, literal_column, select, text, update
+
+from app.core.secure import hash_token
+from app.models.database import Base, engine
+from app.models.refresh_token import UserRefreshToken
+from app.models import user, user_privacy  # noqa: F401  (relasi harus ke-register)
+
+TABLE = UserRefreshToken.__tablename__
+
+
+def _backfill(conn_engine, batch_size: int) -> int:
+    table = UserRefreshToken.__table__
+    legacy_token = literal_column("token")
+    migrated = 0
+    while True:
+        with conn_engine.begin() as conn:
+            rows = conn.execute(
+                select(table.c.id, legacy_token)
+                .select_from(table)
+                .where(table.c.token_hash.is_(None))
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return migrated
+            conn.execute(
+                update(table).where(table.c.id == bindparam("row_id")).values(token_hash=bindparam("digest")),
+                [{"row_id": row[0], "digest": hash_token(row[1])} for row in rows],
+            )
+        migrated += len(rows)
+
+
+def _create_missing_indexes(conn_engine):
+    existing = {index["name"] for index in inspect(conn_engine).get_indexes(TABLE)}
+    for index in UserRefreshToken.__table__.indexes:
+        if index.name not in existing:
+            index.create(bind=conn_engine)
+            print(f"created index {index.name}")
+
+
+def migrate(batch_size: int = 1000):
+    inspector = inspect(engine)
+    if TABLE not in inspector.get_table_names():
+        Base.metadata.create_all(bind=engine, tables=[UserRefreshToken.__table__])
+        print(f"{TABLE} created")
+        return
+
+    columns = {column["name"] for column in inspector.get_columns(TABLE)}
+    if "token" in columns:
+        if engine.dialect.name != "mysql":
+            # dev (sqlite dsb.): refresh token cuma data sementara, cukup buat ulang tabelnya
+            UserRefreshToken.__table__.drop(bind=engine)
+            Base.metadata.create_all(bind=engine, tables=[UserRefreshToken.__table__])
+            print(f"{TABLE} recreated, existing sessions dropped")
+            return
+
+        with engine.begin() as conn:
+            if "token_hash" not in columns:
+                conn.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN token_hash CHAR(64) NULL"))
+        print(f"backfilled {_backfill(engine, batch_size)} rows")
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"ALTER TABLE {TABLE} MODIFY token_hash CHAR(64) NOT NULL, DROP COLUMN token"
+            ))
+
+    _create_missing_indexes(engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    migrate(batch_size=parser.parse_args().batch_size)
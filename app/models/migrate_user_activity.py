@@ -0,0 +1,35 @@
+"""Tambah kolom ``last_login_at`` / ``last_seen_at`` ke exordium_users.
+
+    python -m app.models.migrate_user_activity
+
+Jalankan sebelum deploy versi yang memetakan kolom ini (query ``select(User)``
+langsung error kalau kolomnya belum ada). Aman dijalankan berulang kali.
+"""
+from sqlalchemy import inspect, text
+
+from app.models.database import Base, engine
+from app.models.user import User
+from app.models import refresh_token, user_privacy  # noqa: F401  (relasi harus ke-register)
+
+TABLE = User.__tablename__
+COLUMNS = (User.__table__.c.last_login_at, User.__table__.c.last_seen_at)
+
+
+def migrate():
+    inspector = inspect(engine)
+    if TABLE not in inspector.get_table_names():
+        Base.metadata.create_all(bind=engine, tables=[User.__table__])
+        print(f"{TABLE} created")
+        return
+
+    existing = {column["name"] for column in inspector.get_columns(TABLE)}
+    with engine.begin() as conn:
+        for column in COLUMNS:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN {column.name} {column_type} NULL"))
+                print(f"added column {TABLE}.{column.name}")
+
+
+if __name__ == "__main__":
+    migrate()
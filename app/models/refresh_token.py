@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CHAR, Index, func
 from sqlalchemy.orm import relationship
 from app.models.database import Base
 
 class UserRefreshToken(Base):
     __tablename__ = "exordium_user_refresh_token"
+    __table_args__ = (
+        Index("ux_refresh_token_hash", "token_hash", unique=True),
+        Index("ix_refresh_token_user_session", "user_id", "session_id"),
+        Index("ix_refresh_token_expires_at", "expires_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("exordium_users.id"), nullable=False)
-    token = Column(String(512), nullable=False, unique=True)
+    # SHA-256 hex dari refresh token, JWT aslinya tidak disimpan (lihat app.core.secure.hash_token)
+    token_hash = Column(CHAR(64), nullable=False)
     session_id = Column(String(255), nullable=False)
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
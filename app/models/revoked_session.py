@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
+from app.models.database import Base
+
+class RevokedSession(Base):
+    """Sesi yang dicabut (logout / evict) selagi access token-nya mungkin masih hidup.
+
+    Cuma dipakai di mode ``AUTH_STATELESS``: tiap worker membaca tabel ini secara
+    incremental (``id`` naik terus) ke denylist di memory. Baris boleh dihapus
+    setelah ``expires_at`` karena access token sesi itu sudah pasti expired.
+    """
+    __tablename__ = "exordium_revoked_session"
+    __table_args__ = (
+        Index("ix_revoked_session_expires_at", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String(255), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,152 @@
+"""Routing baca ke read replica.
+
+Tulis selalu ke primary (``engine`` / ``async_engine``). Baca profil yang aman
+boleh lewat replica: dependency ``get_read_db`` untuk list, ``read`` untuk lookup
+satu baris yang kalau kosong di replica (replica ketinggalan) dicek ulang ke
+primary. Cek validitas sesi (auth) tidak lewat sini, selalu ke primary: sesi
+yang sudah logout masih bisa ada di replica yang lag.
+
+User yang profilnya barusan berubah (``mark_written``: upsert login Google,
+create user) dibaca ``read(..., user_id=...)`` dari primary selama
+``DB_STICKY_SECONDS``; window ini per worker, makanya lookup yang kosong tetap
+fallback ke primary. Replica dicek berkala dan yang error dilewati sampai sehat
+lagi. Tanpa ``DB_REPLICA_URLS`` semuanya jalan ke primary seperti biasa.
+"""
+import asyncio
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models.database import SessionLocal, connect_args, pool_args
+
+
+class ReplicaPool:
+    def __init__(self, engines):
+        self.engines = engines
+        self._healthy = list(engines)
+        self._next = 0
+        self.failures = 0
+
+    @property
+    def healthy(self) -> int:
+        return len(self._healthy)
+
+    def pick(self):
+        healthy = self._healthy
+        if not healthy:
+            return None
+        self._next = (self._next + 1) % len(healthy)
+        return healthy[self._next]
+
+    def mark_down(self, engine):
+        if any(e is engine for e in self._healthy):
+            self._healthy = [e for e in self._healthy if e is not engine]
+            self.failures += 1
+            print("replica marked down:", engine.url.render_as_string(hide_password=True))
+
+    async def check(self):
+        healthy = []
+        for engine in self.engines:
+            try:
+                await run_in_threadpool(_ping, engine)
+                healthy.append(engine)
+            except Exception as e:
+                print("replica health check failed:", engine.url.render_as_string(hide_password=True), e)
+        self._healthy = healthy
+
+
+def _ping(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def _urls(value: str):
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+replicas = ReplicaPool(
+    [
+        create_engine(url, pool_pre_ping=True, connect_args=connect_args, **pool_args)
+        for url in _urls(settings.DB_REPLICA_URLS)
+    ]
+)
+
+# user_id -> sampai kapan (monotonic) bacaannya harus dari primary
+_sticky: dict[int, float] = {}
+_stats = {"replica_reads": 0, "primary_reads": 0, "primary_fallbacks": 0}
+
+
+def mark_written(user_id):
+    """Panggil setelah commit yang mengubah baris user ini (yang dibaca lewat replica)."""
+    if not replicas.engines:
+        return
+    now = time.monotonic()
+    _sticky[int(user_id)] = now + settings.DB_STICKY_SECONDS
+    if len(_sticky) > 10000:
+        for key in [k for k, until in _sticky.items() if until <= now]:
+            del _sticky[key]
+
+
+def _is_sticky(user_id) -> bool:
+    if user_id is None:
+        return False
+    until = _sticky.get(int(user_id))
+    return until is not None and until > time.monotonic()
+
+
+def _pick(pool: ReplicaPool, user_id=None):
+    if _is_sticky(user_id):
+        return None
+    return pool.pick()
+
+
+def read(fn, user_id=None):
+    """``fn(db)`` di replica; error atau hasil None diulang di primary."""
+    replica = _pick(replicas, user_id)
+    if replica is not None:
+        try:
+            with SessionLocal(bind=replica) as db:
+                result = fn(db)
+            _stats["replica_reads"] += 1
+            if result is not None:
+                return result
+        except DBAPIError as e:
+            print("replica read error:", e)
+            replicas.mark_down(replica)
+        _stats["primary_fallbacks"] += 1
+    _stats["primary_reads"] += 1
+    with SessionLocal() as db:
+        return fn(db)
+
+
+def get_read_db():
+    """Dependency read-only (tanpa stickiness / fallback): list, stream, dsb."""
+    replica = replicas.pick()
+    db = SessionLocal(bind=replica) if replica is not None else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def run_health_checks():
+    while True:
+        await asyncio.sleep(settings.DB_REPLICA_CHECK_SECONDS)
+        try:
+            await replicas.check()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print("replica health check error:", e)
+
+
+def stats() -> dict:
+    return {
+        **_stats,
+        "replicas_healthy": replicas.healthy,
+        "replica_failures": replicas.failures,
+        "sticky_users": len(_sticky),
+    }
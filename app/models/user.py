@@ -12,6 +12,9 @@ class User(Base):
     name = Column(String(255), nullable=True)
     pict_uri = Column(String(255), nullable=True)
     created_at = Column(DateTime, server_default=func.now())
+    # diisi app.helper.activity_buffer (write-behind, bisa telat beberapa detik)
+    last_login_at = Column(DateTime, nullable=True)
+    last_seen_at = Column(DateTime, nullable=True)
 
     refresh_tokens = relationship("UserRefreshToken", back_populates="user", cascade="all, delete-orphan")
     privacy = relationship("UserPrivacy", back_populates="user", uselist=False)
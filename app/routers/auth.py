@@ -1,12 +1,18 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Request
-from fastapi.responses import JSONResponse, Response, RedirectResponse
+from fastapi.responses import Response, RedirectResponse
+from app.core.responses import FastJSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import urllib.parse
 
-from app.models.database import get_db
+from app.models.database import get_db, get_async_db
 from app.config import settings
 from app.models.user import User
 from app.core.secure import get_current_user_from_cookie
+from app.core.session_cache import UserSnapshot
+from app.core.crypto import key_ring
+from app.core.etag import conditional_json, snapshot_etag
+from app.core.rate_limit import enforce_rate_limit, bucket
 
 from app.helper.token_service import TokenService
 from app.schemas.set_pass import SetPasswordRequest
@@ -17,9 +23,16 @@ from app.controllers.auth_controller import AuthController
 router = APIRouter()
 
 @router.post("/signin")
-async def login(payload: dict, response: Response, db: Session = Depends(get_db)):
+async def login(payload: dict, request: Request, db: AsyncSession = Depends(get_async_db)):
     con = AuthController(db)
-    return await con.login(payload, response)
+    return await con.login(payload, request)
+
+@router.get("/keys")
+def public_keys():
+    return FastJSONResponse(
+        content={"active_kid": key_ring.active_kid, "keys": key_ring.public_keys()},
+        headers={"Cache-Control": "public, max-age=300"},
+    )
 
 @router.get("/google/login")
 def login_with_google():
@@ -37,32 +50,40 @@ def login_with_google():
 
 
 @router.post("/google/callback")
-async def google_callback(payload: dict, db: Session = Depends(get_db)):
+async def google_callback(payload: dict, db: AsyncSession = Depends(get_async_db)):
     controller = AuthController(db)
     return await controller.google_login_callback(payload)
 
 @router.post("/refresh")
-async def refresh_access_token(request: Request, response: Response, db: Session = Depends(get_db)):
+async def refresh_access_token(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     controller = AuthController(db)
     return await controller.refresh_access_token(request, response)
     
 @router.get("/m")
-async def get_me(curr_usr: User = Depends(get_current_user_from_cookie)):    
-    return JSONResponse(
-        status_code=200,
-        content={
+async def get_me(request: Request, curr_usr: UserSnapshot = Depends(get_current_user_from_cookie)):
+    return conditional_json(
+        request,
+        snapshot_etag(curr_usr),
+        lambda: {
             "id": curr_usr.id,
             "email": curr_usr.email,
             "name": curr_usr.name,
             "pict_uri": curr_usr.pict_uri
-        }
+        },
+        # isinya tergantung cookie sesi
+        headers={"Vary": "Cookie"},
     )
     
 @router.post("/logout")
-async def logout(request: Request, db: Session = Depends(get_db)):
+async def logout(request: Request, db: AsyncSession = Depends(get_async_db)):
     controller = AuthController(db)
     return await controller.logout(request)
 
 @router.post("/set-pass")
-async def set_password(body: SetPasswordRequest, db: Session = Depends(get_db), curr_usr: User = Depends(get_current_user_from_cookie)):
-    return UserPrivacyController.set_or_update_password(db, curr_usr.id, body.p)
\ No newline at end of file
+async def set_password(body: SetPasswordRequest, request: Request, db: Session = Depends(get_db), curr_usr: UserSnapshot = Depends(get_current_user_from_cookie)):
+    client_ip = request.client.host if request.client else "unknown"
+    await enforce_rate_limit([
+        bucket(f"set-pass:user:{curr_usr.id}", settings.SET_PASS_BURST, settings.SET_PASS_PER_MINUTE),
+        bucket(f"set-pass:ip:{client_ip}", settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE),
+    ])
+    return await UserPrivacyController.set_or_update_password(db, curr_usr.id, body.p)
\ No newline at end of file
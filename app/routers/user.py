@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models import user as user_model
-from app.models.database import get_db
+from app.models.database import get_db, SessionLocal
+from app.models import routing
+from app.core.responses import FastJSONResponse
+from app.core.etag import conditional_json, etag_for
+from app.api.crud import USER_RESPONSE_COLUMNS, get_user_row, list_user_rows
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 
 router = APIRouter(
@@ -15,24 +23,59 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     db_user = db.query(user_model.User).filter(user_model.User.email == user.email).first()
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    new_user = user_model.User(**user.dict())
+    new_user = user_model.User(**user.model_dump())
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    routing.mark_written(new_user.id)
     return new_user
 
-# Read all users
+# Read all users (keyset pagination: ?after_id=<id terakhir>&limit=, cursor berikutnya di header X-Next-Cursor)
+# response_model cuma buat dokumentasi; baris sudah dict hasil proyeksi kolom UserResponse
 @router.get("/", response_model=list[UserResponse])
-def get_users(db: Session = Depends(get_db)):
-    return db.query(user_model.User).all()
+def get_users(
+    after_id: int | None = None,
+    limit: int = Query(settings.USERS_PAGE_DEFAULT, ge=1, le=settings.USERS_PAGE_MAX),
+    db: Session = Depends(routing.get_read_db),
+):
+    rows = list_user_rows(db, after_id, limit)
+    headers = {"X-Next-Cursor": str(rows[-1]["id"])} if len(rows) == limit else None
+    return FastJSONResponse(content=rows, headers=headers)
+
+# Stream all users as NDJSON, memory tetap flat berapapun jumlah barisnya
+@router.get("/stream")
+def stream_users(after_id: int | None = None):
+    return StreamingResponse(_iter_users_ndjson(after_id), media_type="application/x-ndjson")
+
+def _iter_users_ndjson(after_id: int | None):
+    User = user_model.User
+    batch_size = settings.USERS_STREAM_BATCH_SIZE
+    # session sendiri: dependency get_db sudah ditutup sebelum body selesai di-stream
+    replica = routing.replicas.pick()
+    db = SessionLocal(bind=replica) if replica is not None else SessionLocal()
+    try:
+        while True:
+            stmt = select(*USER_RESPONSE_COLUMNS).order_by(User.id).limit(batch_size)
+            if after_id is not None:
+                stmt = stmt.where(User.id > after_id)
+            rows = db.execute(stmt).mappings().all()
+            for row in rows:
+                yield orjson.dumps(dict(row)) + b"\n"
+            if len(rows) < batch_size:
+                break
+            after_id = rows[-1]["id"]
+    finally:
+        db.close()
 
 # Read single user
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(user_model.User).filter(user_model.User.id == user_id).first()
+def get_user(user_id: int, request: Request):
+    # user yang barusan berubah (mark_written) dibaca dari primary
+    user = routing.read(lambda db: get_user_row(db, user_id), user_id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    # ETag dari isi baris (kolom proyeksi UserResponse); 304 tidak perlu serialize body
+    return conditional_json(request, etag_for(tuple(user.values())), lambda: user)
 
 # Update user
 # @router.put("/{user_id}", response_model=UserResponse)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+
+from app.core.responses import PreEncodedJSONResponse, pre_encode
+from app.core.token_backend import token_backend
+
+router = APIRouter()
+
+# key cuma berubah saat restart, cukup di-encode sekali
+JWKS_BODY = pre_encode(token_backend.jwks())
+
+# Public key buat verifikasi access token di service lain (kosong kalau masih HS256)
+@router.get("/.well-known/jwks.json", include_in_schema=False)
+def jwks():
+    return PreEncodedJSONResponse(JWKS_BODY, headers={"Cache-Control": "public, max-age=300"})
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class UserBase(BaseModel):
@@ -12,10 +12,11 @@ class UserUpdate(BaseModel):
     name: Optional[str] = None
 
 class UserResponse(BaseModel):
+    # ikut nullable kolom di User: user non-Google tidak punya google_id,
+    # name boleh kosong
     id: int
-    google_id: str
+    google_id: Optional[str] = None
     email: str
-    name: str
+    name: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
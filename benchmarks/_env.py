@@ -0,0 +1,37 @@
+"""Shared setup for the benchmarks: point the app at a throwaway SQLite database.
+
+Must be imported before anything under ``app`` so the settings pick it up.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+WORKDIR = tempfile.mkdtemp(prefix="exordium-bench-")
+DB_PATH = os.path.join(WORKDIR, "bench.db")
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", f"sqlite:///{DB_PATH}")
+os.environ.setdefault("SQLALCHEMY_ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{DB_PATH}")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("RATE_LIMIT_DB_PATH", os.path.join(WORKDIR, "ratelimit.db"))
+
+
+def count_queries(*engines):
+    """Attach a statement counter to ``engines`` and return it (``counter["n"]``).
+
+    Async engines are accepted too; the listener goes on their ``sync_engine``.
+    """
+    from sqlalchemy import event
+
+    counter = {"n": 0}
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter["n"] += 1
+
+    for engine in engines:
+        event.listen(getattr(engine, "sync_engine", engine), "before_cursor_execute", _count)
+    return counter
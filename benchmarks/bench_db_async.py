@@ -0,0 +1,76 @@
+"""Throughput of the session lookup done by get_current_user_from_cookie, issued
+from many concurrent coroutines: blocking sync Session vs AsyncSession.
+
+    python benchmarks/bench_db_async.py
+
+SQLite only shows the shape of the difference; export SQLALCHEMY_DATABASE_URL
+and SQLALCHEMY_ASYNC_DATABASE_URL pointing at MySQL for real numbers.
+"""
+import asyncio
+import json
+import time
+
+import _env  # noqa: F401
+from sqlalchemy import select
+
+import app.main  # noqa: F401  (registers every model)
+from app.helper.token_service import TokenService
+from app.models.database import AsyncSessionLocal, SessionLocal, init_db
+from app.models.refresh_token import UserRefreshToken
+from app.models.user import User
+
+CONCURRENCY = (1, 8, 32)
+LOOKUPS_PER_TASK = 200
+
+
+def lookup_stmt(user_id, session_id):
+    return select(UserRefreshToken.id).filter_by(user_id=user_id, session_id=session_id).limit(1)
+
+
+async def sync_worker(user_id, session_id):
+    # sama persis dengan jalur lama: Session sync dipanggil dari coroutine, satu
+    # Session per lookup (= per request). Koneksi dikembalikan sebelum yield ke
+    # event loop: kalau ditahan, concurrency > ukuran pool bikin checkout
+    # berikutnya nge-block loop selamanya sementara pemegang koneksi tidak bisa jalan.
+    for _ in range(LOOKUPS_PER_TASK):
+        with SessionLocal() as db:
+            db.execute(lookup_stmt(user_id, session_id)).first()
+        await asyncio.sleep(0)
+
+
+async def async_worker(user_id, session_id):
+    for _ in range(LOOKUPS_PER_TASK):
+        async with AsyncSessionLocal() as db:
+            (await db.execute(lookup_stmt(user_id, session_id))).first()
+
+
+async def measure(worker, concurrency, user_id, session_id):
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(user_id, session_id) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return concurrency * LOOKUPS_PER_TASK / elapsed
+
+
+async def main():
+    init_db()
+    async with AsyncSessionLocal() as db:
+        user = User(email="bench-async@example.com", name="bench")
+        db.add(user)
+        await db.commit()
+        await TokenService(db).generate_tokens(user.id)
+        session_id = (await db.execute(
+            select(UserRefreshToken.session_id).where(UserRefreshToken.user_id == user.id)
+        )).scalar_one()
+
+    results = []
+    for concurrency in CONCURRENCY:
+        results.append({
+            "concurrency": concurrency,
+            "sync_queries_per_sec": await measure(sync_worker, concurrency, user.id, session_id),
+            "async_queries_per_sec": await measure(async_worker, concurrency, user.id, session_id),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
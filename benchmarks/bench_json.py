@@ -0,0 +1,44 @@
+"""Response serialization cost: stdlib JSONResponse vs FastJSONResponse, for
+the /users/ page and /auth/m payloads.
+
+    python benchmarks/bench_json.py
+"""
+import json
+import time
+
+import _env  # noqa: F401
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.core.responses import FastJSONResponse, PreEncodedJSONResponse, LOGGED_OUT_BODY
+
+ITERATIONS = 2000
+
+USERS_PAGE = [
+    {"id": i, "google_id": f"1{i:020d}", "email": f"user{i}@example.com", "name": f"User Number {i}"}
+    for i in range(settings.USERS_PAGE_MAX)
+]
+ME = {"id": 42, "email": "someone@example.com", "name": "Someone", "pict_uri": "https://lh3.googleusercontent.com/a/abc"}
+
+
+def measure(build):
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        build()
+    return (time.perf_counter() - started) / ITERATIONS * 1e6
+
+
+def main():
+    results = {
+        "users_page_stdlib_us": measure(lambda: JSONResponse(USERS_PAGE)),
+        "users_page_fast_us": measure(lambda: FastJSONResponse(USERS_PAGE)),
+        "me_stdlib_us": measure(lambda: JSONResponse(ME)),
+        "me_fast_us": measure(lambda: FastJSONResponse(ME)),
+        "logout_stdlib_us": measure(lambda: JSONResponse({"message": "Logged Out"})),
+        "logout_pre_encoded_us": measure(lambda: PreEncodedJSONResponse(LOGGED_OUT_BODY)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
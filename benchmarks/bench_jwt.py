@@ -0,0 +1,84 @@
+"""Encode/decode throughput: python-jose (key passed as secret/PEM on every call)
+vs the pyjwt backends in app.core.token_backend (key objects built once).
+
+    python benchmarks/bench_jwt.py
+"""
+import json
+import time
+from datetime import datetime, timedelta
+
+import _env  # noqa: F401
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jose import jwt as jose_jwt
+
+from app.core.token_backend import AsymmetricBackend, HMACBackend
+
+ITERATIONS = 2000
+SECRET = "bench-secret-" + "x" * 32
+CLAIMS = {
+    "sub": "42",
+    "session_id": "3f1c6a52-4c1e-4d0a-9a57-6c4a7b9e1f00",
+    "email": "bench@example.com",
+    "name": "Bench",
+    "pict_uri": None,
+    "jti": "5b2f0d7e-4c1e-4d0a-9a57-6c4a7b9e1f00",
+    "exp": datetime.utcnow() + timedelta(days=1),
+}
+
+
+def private_pem(key) -> bytes:
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+
+
+def public_pem(key) -> bytes:
+    return key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+
+
+def ops_per_sec(fn, iterations=ITERATIONS):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def measure(name, encode, decode):
+    token = encode()
+    assert decode(token)["sub"] == CLAIMS["sub"]
+    return {
+        "impl": name,
+        "encode_per_sec": ops_per_sec(encode),
+        "decode_per_sec": ops_per_sec(lambda: decode(token)),
+    }
+
+
+def main():
+    ec_key = ec.generate_private_key(ec.SECP256R1())
+    ed_key = ed25519.Ed25519PrivateKey.generate()
+    ec_private, ec_public = private_pem(ec_key).decode(), public_pem(ec_key).decode()
+
+    hmac = HMACBackend(SECRET, "HS256")
+    es256 = AsymmetricBackend(private_pem(ec_key), "ES256")
+    eddsa = AsymmetricBackend(private_pem(ed_key), "EdDSA")
+
+    results = [
+        measure(
+            "jose HS256",
+            lambda: jose_jwt.encode(CLAIMS, SECRET, algorithm="HS256"),
+            lambda token: jose_jwt.decode(token, SECRET, algorithms=["HS256"]),
+        ),
+        measure("pyjwt HS256 (HMACBackend)", lambda: hmac.encode(CLAIMS), hmac.decode),
+        measure(
+            "jose ES256 (PEM per call)",
+            lambda: jose_jwt.encode(CLAIMS, ec_private, algorithm="ES256"),
+            lambda token: jose_jwt.decode(token, ec_public, algorithms=["ES256"]),
+        ),
+        measure("pyjwt ES256 (AsymmetricBackend)", lambda: es256.encode(CLAIMS), es256.decode),
+        measure("pyjwt EdDSA (AsymmetricBackend)", lambda: eddsa.encode(CLAIMS), eddsa.decode),
+    ]
+    print(json.dumps({"iterations": ITERATIONS, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
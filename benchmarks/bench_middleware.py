@@ -0,0 +1,110 @@
+"""Per-request overhead of the CORS/CSRF layer: old CORSMiddleware +
+BaseHTTPMiddleware stack vs the raw-ASGI CORSCSRFMiddleware.
+
+    python benchmarks/bench_middleware.py
+"""
+import asyncio
+import json
+import time
+
+import _env  # noqa: F401
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+
+from app.middlewares.csrf_middleware import CORSCSRFMiddleware
+
+ITERATIONS = 20000
+ORIGINS = ["http://localhost:5173", "http://exordium.id", "https://exordium.id"]
+
+
+class LegacyCSRFMiddleware(BaseHTTPMiddleware):
+    # salinan CSRFMiddleware sebelum user-010, cuma buat pembanding
+    async def dispatch(self, request: Request, call_next):
+        if request.method == "OPTIONS":
+            origin = request.headers.get("origin")
+            return JSONResponse(
+                status_code=200,
+                content={},
+                headers={
+                    "Access-Control-Allow-Origin": origin or "*",
+                    "Access-Control-Allow-Credentials": "true",
+                    "Access-Control-Allow-Headers": "Content-Type, X-CSRF-TOKEN, x-requested-with",
+                    "Access-Control-Allow-Methods": "GET, POST, PUT, PATCH, DELETE, OPTIONS",
+                },
+            )
+        if request.url.path.startswith("/auth"):
+            return await call_next(request)
+        if request.method in ("POST", "PUT", "PATCH", "DELETE") or request.url.path in ["/data/data"]:
+            csrf_cookie = request.cookies.get("XSRF-TOKEN")
+            csrf_header = request.headers.get("X-CSRF-TOKEN")
+            if not csrf_cookie or not csrf_header or csrf_cookie != csrf_header:
+                return JSONResponse(status_code=403, content={"detail": "Your CSRF is not valid"})
+        return await call_next(request)
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def legacy_stack():
+    inner = CORSMiddleware(endpoint, allow_origins=ORIGINS, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+    return LegacyCSRFMiddleware(inner)
+
+
+def new_stack():
+    return CORSCSRFMiddleware(endpoint, allow_origins=ORIGINS)
+
+
+def scope_for(method, path):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "scheme": "https",
+        "query_string": b"",
+        "server": ("testserver", 443),
+        "client": ("127.0.0.1", 1234),
+        "http_version": "1.1",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"origin", b"https://exordium.id"),
+            (b"cookie", b"XSRF-TOKEN=abc; access_token=x"),
+            (b"x-csrf-token", b"abc"),
+        ],
+    }
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def measure(app, method, path):
+    scope = scope_for(method, path)
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / ITERATIONS * 1e6
+
+
+async def main():
+    results = []
+    for method, path in (("GET", "/users/"), ("GET", "/data/data"), ("POST", "/auth/signin")):
+        results.append({
+            "request": f"{method} {path}",
+            "legacy_us": await measure(legacy_stack(), method, path),
+            "asgi_us": await measure(new_stack(), method, path),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""Read-replica routing against two local SQLite files (primary + "replica").
+
+Nothing replicates between the files, so a row written only to the primary
+plays the part of replication lag. Also registers a replica that cannot be
+opened to show it being dropped by the health check. Prints where each read
+landed (statement counts per engine) as JSON::
+
+    python benchmarks/bench_read_replica.py
+"""
+import asyncio
+import json
+import os
+
+import _env
+
+REPLICA_PATH = os.path.join(_env.WORKDIR, "replica.db")
+BROKEN_PATH = os.path.join(_env.WORKDIR, "missing-dir", "replica.db")
+os.environ.setdefault("DB_REPLICA_URLS", f"sqlite:///{REPLICA_PATH},sqlite:///{BROKEN_PATH}")
+
+from sqlalchemy import insert  # noqa: E402
+
+import app.main  # noqa: E402,F401  (registers every model)
+from app.api.crud import get_user_row  # noqa: E402
+from app.models import routing  # noqa: E402
+from app.models.database import Base, SessionLocal, engine, init_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+REPLICATED = {"id": 1, "email": "both@example.com", "google_id": "g1", "name": "On both"}
+LAGGING = {"id": 2, "email": "primary-only@example.com", "google_id": "g2", "name": "Primary only"}
+
+
+def snapshot(counters):
+    return {name: counter["n"] for name, counter in counters.items()}
+
+
+def step(counters, label, fn):
+    before = snapshot(counters)
+    result = fn()
+    after = snapshot(counters)
+    return {
+        "step": label,
+        "found": result is not None,
+        "statements": {name: after[name] - before[name] for name in after if after[name] != before[name]},
+    }
+
+
+async def main():
+    init_db()
+    replica = routing.replicas.engines[0]
+    Base.metadata.create_all(bind=replica)
+    with SessionLocal() as db:
+        db.execute(insert(User), [REPLICATED, LAGGING])
+        db.commit()
+    with SessionLocal(bind=replica) as db:
+        db.execute(insert(User), [REPLICATED])
+        db.commit()
+
+    await routing.replicas.check()
+    counters = {"primary": _env.count_queries(engine), "replica": _env.count_queries(replica)}
+
+    steps = [
+        step(counters, "read replicated row", lambda: routing.read(lambda db: get_user_row(db, 1))),
+        step(counters, "read row missing on replica (fallback)", lambda: routing.read(lambda db: get_user_row(db, 2))),
+    ]
+    routing.mark_written(1)
+    steps.append(step(counters, "read right after a write (sticky)", lambda: routing.read(lambda db: get_user_row(db, 1), user_id=1)))
+
+    print(json.dumps({
+        "healthy_replicas": routing.replicas.healthy,
+        "configured_replicas": len(routing.replicas.engines),
+        "steps": steps,
+        "routing": routing.stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""DB queries and latency of get_current_user_from_cookie, cold vs warm cache.
+
+    python benchmarks/bench_session_cache.py
+"""
+import asyncio
+import json
+import time
+
+import _env  # noqa: F401
+from starlette.requests import Request
+
+import app.main  # noqa: F401  (registers every model)
+from app.core.secure import get_current_user_from_cookie
+from app.core.session_cache import session_cache
+from app.helper.token_service import TokenService
+from app.models.database import AsyncSessionLocal, async_engine, init_db
+from app.models.user import User
+
+ITERATIONS = 2000
+
+
+def make_request(access_token):
+    cookie = f"access_token={access_token}".encode()
+    return Request({"type": "http", "headers": [(b"cookie", cookie)]})
+
+
+async def run(label, request, counter, clear):
+    counter["n"] = 0
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        if clear:
+            session_cache.clear()
+        await get_current_user_from_cookie(request)
+    elapsed = time.perf_counter() - started
+    return {
+        "case": label,
+        "queries_per_request": counter["n"] / ITERATIONS,
+        "us_per_request": elapsed / ITERATIONS * 1e6,
+    }
+
+
+async def main():
+    init_db()
+    counter = _env.count_queries(async_engine)
+    async with AsyncSessionLocal() as db:
+        user = User(email="bench@example.com", name="bench")
+        db.add(user)
+        await db.commit()
+        access_token, *_ = await TokenService(db).generate_tokens(user.id)
+    request = make_request(access_token)
+
+    results = [
+        await run("cold", request, counter, clear=True),
+        await run("warm", request, counter, clear=False),
+    ]
+    print(json.dumps({"results": results, "cache": session_cache.stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""Login / refresh token issuance: old two-commit flow vs TokenService.
+
+    python benchmarks/bench_token_issuance.py
+"""
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+
+import _env  # noqa: F401
+from sqlalchemy import delete, select
+
+import app.main  # noqa: F401  (registers every model)
+from app.config import settings
+from app.core.secure import hash_token
+from app.core.token_backend import token_backend
+from app.helper.token_service import TokenService
+from app.models.database import AsyncSessionLocal, async_engine, init_db
+from app.models.refresh_token import UserRefreshToken
+from app.models.user import User
+
+ITERATIONS = 300
+
+
+async def legacy_generate_tokens(db, user_id):
+    # alur sebelum user-007: DELETE + commit, INSERT + commit, sesi baru tiap refresh
+    service = TokenService(db)
+    session_id = str(uuid.uuid4())
+    await db.execute(delete(UserRefreshToken).where(UserRefreshToken.user_id == user_id))
+    await db.commit()
+    access_token, refresh_token = service._issue(user_id, session_id)
+    db.add(UserRefreshToken(
+        user_id=user_id,
+        token_hash=hash_token(refresh_token),
+        session_id=session_id,
+        expires_at=datetime.utcnow() + service.refresh_token_expires,
+        created_at=datetime.utcnow().replace(microsecond=0),
+    ))
+    await db.commit()
+    return access_token, refresh_token
+
+
+async def timed(label, counter, fn):
+    counter["n"] = 0
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await fn()
+    elapsed = time.perf_counter() - started
+    return {
+        "case": label,
+        "ops_per_sec": ITERATIONS / elapsed,
+        "statements_per_op": counter["n"] / ITERATIONS,
+    }
+
+
+async def main():
+    init_db()
+    counter = _env.count_queries(async_engine)
+    async with AsyncSessionLocal() as db:
+        user = User(email="bench-issue@example.com", name="bench")
+        db.add(user)
+        await db.commit()
+        service = TokenService(db)
+        state = {}
+
+        async def legacy_login():
+            _, state["legacy_refresh"] = await legacy_generate_tokens(db, user.id)
+
+        async def legacy_refresh():
+            await db.execute(select(UserRefreshToken).where(
+                UserRefreshToken.user_id == user.id,
+                UserRefreshToken.token_hash == hash_token(state["legacy_refresh"]),
+            ))
+            _, state["legacy_refresh"] = await legacy_generate_tokens(db, user.id)
+
+        async def new_login():
+            _, state["refresh"], *_ = await service.generate_tokens(user.id)
+
+        async def new_refresh():
+            claims = token_backend.unverified_claims(state["refresh"])
+            tokens = await service.rotate_tokens(user.id, claims["session_id"], state["refresh"])
+            state["refresh"] = tokens[1]
+
+        results = [
+            await timed("login_before", counter, legacy_login),
+            await timed("refresh_before", counter, legacy_refresh),
+            await timed("login_after", counter, new_login),
+            await timed("refresh_after", counter, new_refresh),
+        ]
+    print(json.dumps({"max_sessions_per_user": settings.MAX_SESSIONS_PER_USER, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""Rows/sec for the user read path: ORM entities + per-row UserResponse
+validation (old get_users) vs the column projection in app.api.crud.
+
+    python benchmarks/bench_user_read.py
+"""
+import json
+import time
+
+import _env  # noqa: F401
+from sqlalchemy import insert
+
+import app.main  # noqa: F401  (registers every model)
+from app.api.crud import list_user_rows
+from app.models.database import SessionLocal, init_db
+from app.models.user import User
+from app.schemas.user import UserResponse
+
+ROWS = 5000
+ROUNDS = 5
+
+
+def orm_path(db):
+    return [UserResponse.model_validate(user).model_dump() for user in db.query(User).limit(ROWS).all()]
+
+
+def projection_path(db):
+    return list_user_rows(db, after_id=None, limit=ROWS)
+
+
+def measure(fn, db):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        db.expunge_all()
+        fn(db)
+    return ROWS * ROUNDS / (time.perf_counter() - started)
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    db.execute(insert(User), [
+        {"email": f"user{i}@example.com", "google_id": f"g{i}", "name": f"User {i}", "pict_uri": None}
+        for i in range(ROWS)
+    ])
+    db.commit()
+    print(json.dumps({
+        "rows": ROWS,
+        "orm_rows_per_sec": measure(orm_path, db),
+        "projection_rows_per_sec": measure(projection_path, db),
+    }, indent=2))
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
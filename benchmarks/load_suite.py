@@ -0,0 +1,271 @@
+"""Load/latency suite for the auth flows, run fully in-process.
+
+Boots ``app.main:app`` (lifespan included) against a throwaway SQLite database,
+with a freshly generated RSA key pair for sign-in and Google OAuth replaced by
+a local mock (token endpoint + JWKS signed with a local key). Each scenario is
+driven at fixed concurrency levels; results are printed as JSON so runs can be
+diffed::
+
+    python benchmarks/load_suite.py --requests 400 --concurrency 1 8 32 --output bench_output.json
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform
+import time
+from datetime import datetime, timedelta
+from http.cookies import SimpleCookie
+
+import _env
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+KEYS_DIR = os.path.join(_env.WORKDIR, "keys")
+GOOGLE_CLIENT_ID = "bench-client-id"
+PASSWORD = "bench-password-123"
+
+os.makedirs(KEYS_DIR, exist_ok=True)
+_login_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+with open(os.path.join(KEYS_DIR, "bench.pem"), "wb") as f:
+    f.write(_login_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+
+os.environ.setdefault("RSA_KEYS_DIR", KEYS_DIR)
+os.environ.setdefault("GOOGLE_CLIENT_ID", GOOGLE_CLIENT_ID)
+os.environ.setdefault("GOOGLE_TOKEN_ENDPOINT", "https://google.test/token")
+os.environ.setdefault("GOOGLE_OAUTH_USERINFO", "https://google.test/userinfo")
+os.environ.setdefault("GOOGLE_JWKS_URI", "https://google.test/certs")
+os.environ.setdefault("TOKEN_REAPER_ENABLED", "false")
+# tiap worker benchmark pegang sesi sendiri, jangan saling evict
+os.environ.setdefault("MAX_SESSIONS_PER_USER", "100000")
+os.environ.setdefault("HASH_POOL_MAX_QUEUE", "1024")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+from jose import jwk, jwt  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.http_client import http_client  # noqa: E402
+from app.core.passwords import password_service  # noqa: E402
+from app.helper.token_service import TokenService  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.database import AsyncSessionLocal, async_engine, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.user_privacy import UserPrivacy  # noqa: E402
+
+SEED_USERS = 1000
+BENCH_EMAIL = "bench-login@example.com"
+
+
+class MockGoogle:
+    """Token endpoint + JWKS Google palsu; id_token ditandatangani key lokal."""
+
+    def __init__(self):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        self.jwks = {"keys": [{**jwk.construct(public_pem, "RS256").to_dict(), "kid": "bench", "use": "sig"}]}
+        self.logins = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/certs":
+            return httpx.Response(200, json=self.jwks, headers={"Cache-Control": "public, max-age=3600"})
+        if request.url.path == "/token":
+            self.logins += 1
+            # sebagian email berulang supaya jalur "user sudah ada" ikut kena
+            email = f"google{self.logins % 50}@example.com"
+            now = datetime.utcnow()
+            id_token = jwt.encode(
+                {
+                    "iss": "https://accounts.google.com",
+                    "aud": GOOGLE_CLIENT_ID,
+                    "sub": email,
+                    "email": email,
+                    "email_verified": True,
+                    "name": "Google Bench",
+                    "picture": "https://example.com/p.png",
+                    "iat": now,
+                    "exp": now + timedelta(hours=1),
+                },
+                self.private_pem,
+                algorithm="RS256",
+                headers={"kid": "bench"},
+            )
+            return httpx.Response(200, json={"access_token": "ya29.bench", "id_token": id_token})
+        return httpx.Response(404, json={"error": "not_found"})
+
+
+def cookie_header(values: dict) -> str:
+    return "; ".join(f"{k}={v}" for k, v in values.items())
+
+
+def cookies_from(response: httpx.Response) -> dict:
+    jar = SimpleCookie()
+    for header in response.headers.get_list("set-cookie"):
+        jar.load(header)
+    return {name: morsel.value for name, morsel in jar.items()}
+
+
+async def seed():
+    # cost sama dengan yang dipakai app, supaya sign-in tidak ikut rehash
+    hashed = password_service.context.hash(PASSWORD)
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(User), [
+            {"email": f"seed{i}@example.com", "google_id": f"seed{i}", "name": f"Seed {i}"}
+            for i in range(SEED_USERS)
+        ])
+        user = User(email=BENCH_EMAIL, google_id="bench", name="Bench")
+        db.add(user)
+        await db.flush()
+        db.add(UserPrivacy(user_id=user.id, user_password=hashed))
+        await db.commit()
+        return user.id
+
+
+async def make_session_cookies(user_id: int) -> dict:
+    async with AsyncSessionLocal() as db:
+        access_token, refresh_token, *_ = await TokenService(db).generate_tokens(user_id)
+    return {"access_token": access_token, "refresh_token": refresh_token, "XSRF-TOKEN": "bench-xsrf"}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client, name, send_one, concurrency, total, counter, user_id):
+    per_worker = max(total // concurrency, 1)
+    latencies = []
+    errors = 0
+
+    async def worker(state):
+        nonlocal errors
+        for _ in range(per_worker):
+            started = time.perf_counter()
+            response = await send_one(client, state)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                state.update(cookies_from(response))
+
+    # tiap worker pegang sesi sendiri; dibuat di luar jam ukur dan hitungan query
+    states = [await make_session_cookies(user_id) for _ in range(concurrency)]
+    counter["n"] = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(state) for state in states))
+    elapsed = time.perf_counter() - started
+
+    requests = per_worker * concurrency
+    latencies.sort()
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "db_queries_per_request": counter["n"] / requests,
+    }
+
+
+def encrypted_password(public_key):
+    return base64.b64encode(public_key.encrypt(PASSWORD.encode(), padding.PKCS1v15())).decode()
+
+
+async def signin(client, state):
+    payload = {"_e": BENCH_EMAIL, "_p": encrypted_password(_login_key.public_key()), "_k": "bench"}
+    return await client.post("/auth/signin", json=payload)
+
+
+async def refresh(client, state):
+    return await client.post("/auth/refresh", headers={"Cookie": cookie_header(state)})
+
+
+async def refresh_tabs(client, state):
+    # beberapa tab refresh bareng pakai cookie yang sama; yang gagal ikut kehitung error
+    responses = await asyncio.gather(*(refresh(client, state) for _ in range(4)))
+    return max(responses, key=lambda response: response.status_code)
+
+
+async def me(client, state):
+    return await client.get("/auth/m", headers={"Cookie": cookie_header(state)})
+
+
+async def data(client, state):
+    headers = {"Cookie": cookie_header(state), "X-CSRF-TOKEN": state["XSRF-TOKEN"]}
+    return await client.get("/data/data", headers=headers)
+
+
+async def google_callback(client, state):
+    return await client.post("/auth/google/callback", json={"code": "bench-code"})
+
+
+async def users(client, state):
+    return await client.get("/users/", params={"limit": 50})
+
+
+SCENARIOS = {
+    "signin": signin,
+    "refresh": refresh,
+    "refresh_tabs": refresh_tabs,
+    "me": me,
+    "data": data,
+    "google_callback": google_callback,
+    "users": users,
+}
+
+
+async def main(args):
+    counter = _env.count_queries(engine, async_engine)
+    google = MockGoogle()
+    results = []
+    async with app.router.lifespan_context(app):
+        await http_client.start(transport=httpx.MockTransport(google.handler))
+        user_id = await seed()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="https://testserver") as client:
+            for name in args.scenarios:
+                for concurrency in args.concurrency:
+                    total = args.signin_requests if name == "signin" else args.requests
+                    results.append(await run_scenario(
+                        client, name, SCENARIOS[name], concurrency, total, counter, user_id,
+                    ))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": engine.dialect.name,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Auth flow load/latency suite")
+    parser.add_argument("--requests", type=int, default=400, help="requests per scenario and concurrency level")
+    parser.add_argument("--signin-requests", type=int, default=64, help="sign-in is bcrypt bound, keep it smaller")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    asyncio.run(main(parser.parse_args()))
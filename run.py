@@ -1,13 +1,79 @@
+import argparse
+import importlib.util
+import os
+
 import uvicorn
-from app.main import app
 from app.config import settings
 
-if __name__ == "__main__":
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _apply_pool_budget(workers: int):
+    """Bagi DB_MAX_CONNECTIONS ke semua worker; tiap worker punya 2 engine (sync + async).
+
+    Ditulis ke env supaya ikut terbaca app.config di proses worker.
+    """
+    per_engine = max(settings.DB_MAX_CONNECTIONS // (workers * 2), 1)
+    pool_size = max(per_engine * 2 // 3, 1)
+    os.environ.setdefault("DB_POOL_SIZE", str(pool_size))
+    os.environ.setdefault("DB_MAX_OVERFLOW", str(per_engine - pool_size))
+
+
+def _apply_bcrypt_rounds():
+    """Kalibrasi cost bcrypt sekali di master, hasilnya diwariskan lewat env.
+
+    Kalau tiap worker kalibrasi sendiri, hasilnya bisa beda satu round dan hash
+    user bolak-balik di-rehash tiap login pindah worker.
+    """
+    if settings.BCRYPT_ROUNDS:
+        return
+    from app.core.passwords import password_service
+
+    rounds = password_service.calibrate()
+    print(f"bcrypt cost {rounds} ({password_service.hash_ms:.0f} ms/hash, target {settings.BCRYPT_TARGET_MS:.0f} ms)")
+    os.environ["BCRYPT_ROUNDS"] = str(rounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jalankan API exordium")
+    parser.add_argument("--dev", action="store_true", help="mode development: 1 proses + auto reload")
+    parser.add_argument("--host", default=settings.APP_HOST)
+    parser.add_argument("--port", type=int, default=settings.APP_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY or os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.dev:
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            ssl_keyfile=settings.SSL_KEYFILE,
+            ssl_certfile=settings.SSL_CERTFILE,
+        )
+        return
+
+    _apply_pool_budget(args.workers)
+    _apply_bcrypt_rounds()
+    # worker di-restart dengan `kill -HUP <pid master>`; request yang lagi jalan
+    # dikasih waktu GRACEFUL_TIMEOUT_SECONDS sebelum koneksi diputus
     uvicorn.run(
         "app.main:app",
-        host="0.0.0.0",
-        port=4000,
-        reload=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT_SECONDS,
+        timeout_keep_alive=settings.KEEP_ALIVE_SECONDS,
+        proxy_headers=True,
+        access_log=False,
         ssl_keyfile=settings.SSL_KEYFILE,
         ssl_certfile=settings.SSL_CERTFILE,
-    )
\ No newline at end of file
+    )
+
+
+if __name__ == "__main__":
+    main()
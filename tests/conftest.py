@@ -0,0 +1,105 @@
+"""Shared fixtures: the app runs in-process against a throwaway SQLite file
+(sync engine + ``sqlite+aiosqlite``), with a locally generated RSA key for
+sign-in. Env vars are set before anything under ``app`` is imported.
+"""
+import asyncio
+import base64
+import os
+import sys
+import tempfile
+import uuid
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+WORKDIR = tempfile.mkdtemp(prefix="exordium-test-")
+DB_PATH = os.path.join(WORKDIR, "test.db")
+KEYS_DIR = os.path.join(WORKDIR, "keys")
+GOOGLE_CLIENT_ID = "test-client-id"
+
+os.makedirs(KEYS_DIR)
+LOGIN_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+with open(os.path.join(KEYS_DIR, "test.pem"), "wb") as f:
+    f.write(LOGIN_KEY.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+
+os.environ.update({
+    "SQLALCHEMY_DATABASE_URL": f"sqlite:///{DB_PATH}",
+    "SQLALCHEMY_ASYNC_DATABASE_URL": f"sqlite+aiosqlite:///{DB_PATH}",
+    "JWT_SECRET_KEY": "test-secret-" + "x" * 32,
+    "ALGORITHM": "HS256",
+    "RSA_KEYS_DIR": KEYS_DIR,
+    "GOOGLE_CLIENT_ID": GOOGLE_CLIENT_ID,
+    "GOOGLE_TOKEN_ENDPOINT": "https://google.test/token",
+    "GOOGLE_OAUTH_USERINFO": "https://google.test/userinfo",
+    "GOOGLE_JWKS_URI": "https://google.test/certs",
+    "TOKEN_REAPER_ENABLED": "false",
+    "RATE_LIMIT_ENABLED": "false",
+    "RATE_LIMIT_DB_PATH": os.path.join(WORKDIR, "ratelimit.db"),
+    "BCRYPT_ROUNDS": "4",
+})
+
+
+@pytest.fixture(scope="session")
+def loop():
+    # satu loop buat semua test: engine aiosqlite dan background task terikat ke loop ini
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(loop):
+    return loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def app(run):
+    from app.main import app
+
+    lifespan = app.router.lifespan_context(app)
+    run(lifespan.__aenter__())
+    yield app
+    run(lifespan.__aexit__(None, None, None))
+
+
+@pytest.fixture
+def client(app, run):
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="https://testserver")
+    yield client
+    run(client.aclose())
+
+
+def encrypt_password(password: str) -> str:
+    return base64.b64encode(LOGIN_KEY.public_key().encrypt(password.encode(), padding.PKCS1v15())).decode()
+
+
+@pytest.fixture
+def make_user(app, run):
+    """``make_user(password=None) -> (user_id, email)``; email selalu unik per panggilan."""
+    from app.core.passwords import password_service
+    from app.models.database import AsyncSessionLocal
+    from app.models.user import User
+    from app.models.user_privacy import UserPrivacy
+
+    async def create(password):
+        email = f"user-{uuid.uuid4().hex[:12]}@example.com"
+        async with AsyncSessionLocal() as db:
+            user = User(email=email, name="Test User", pict_uri="https://example.com/p.png")
+            db.add(user)
+            await db.flush()
+            if password is not None:
+                db.add(UserPrivacy(user_id=user.id, user_password=password_service.context.hash(password)))
+            await db.commit()
+            return user.id, email
+
+    return lambda password=None: run(create(password))
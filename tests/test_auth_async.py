@@ -0,0 +1,165 @@
+"""Auth controllers on the async DB path (``sqlite+aiosqlite`` stand-in)."""
+from conftest import encrypt_password
+
+PASSWORD = "correct-horse-battery"
+
+
+def signin(run, client, email, password=PASSWORD):
+    return run(client.post("/auth/signin", json={"_e": email, "_p": encrypt_password(password), "_k": "test"}))
+
+
+def test_signin_sets_session_cookies(run, client, make_user):
+    _, email = make_user(PASSWORD)
+
+    response = signin(run, client, email)
+
+    assert response.status_code == 200
+    assert response.json()["user"] == email
+    assert {"access_token", "refresh_token", "XSRF-TOKEN"} <= set(response.cookies)
+
+
+def test_signin_rejects_wrong_password_and_unknown_email(run, client, make_user):
+    _, email = make_user(PASSWORD)
+
+    assert signin(run, client, email, "wrong-password").status_code == 401
+    assert signin(run, client, "nobody@example.com").status_code == 401
+
+
+def test_me_returns_the_signed_in_user(run, client, make_user):
+    user_id, email = make_user(PASSWORD)
+    signin(run, client, email)
+
+    response = run(client.get("/auth/m"))
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": user_id,
+        "email": email,
+        "name": "Test User",
+        "pict_uri": "https://example.com/p.png",
+    }
+
+
+def test_me_requires_a_cookie(run, client):
+    assert run(client.get("/auth/m")).status_code == 401
+
+
+def test_refresh_rotates_the_refresh_token(run, client, make_user):
+    _, email = make_user(PASSWORD)
+    old_refresh = signin(run, client, email).cookies["refresh_token"]
+
+    response = run(client.post("/auth/refresh"))
+
+    assert response.status_code == 200
+    assert response.cookies["refresh_token"] != old_refresh
+    assert run(client.get("/auth/m")).status_code == 200
+
+
+def test_refresh_rejects_an_unknown_token(run, client):
+    response = run(client.post("/auth/refresh", headers={"Cookie": "refresh_token=not-a-jwt"}))
+
+    assert response.status_code == 401
+
+
+def test_logout_ends_the_session(run, client, make_user):
+    _, email = make_user(PASSWORD)
+    access_token = signin(run, client, email).cookies["access_token"]
+
+    assert run(client.post("/auth/logout")).status_code == 200
+
+    client.cookies.clear()
+    assert run(client.get("/auth/m", headers={"Cookie": f"access_token={access_token}"})).status_code == 401
+
+
+def test_new_login_evicts_the_previous_session(run, client, make_user):
+    _, email = make_user(PASSWORD)
+    first_access = signin(run, client, email).cookies["access_token"]
+    signin(run, client, email)
+
+    client.cookies.clear()
+    assert run(client.get("/auth/m", headers={"Cookie": f"access_token={first_access}"})).status_code == 401
+
+
+def test_logout_is_not_undone_by_a_lagging_replica(run, client, make_user, monkeypatch, tmp_path):
+    import shutil
+
+    from sqlalchemy import create_engine
+
+    from app.models import routing
+    from conftest import DB_PATH
+
+    _, email = make_user(PASSWORD)
+    access_token = signin(run, client, email).cookies["access_token"]
+    # snapshot DB sebelum logout = replica yang belum dapat DELETE-nya
+    stale = tmp_path / "replica.db"
+    shutil.copyfile(DB_PATH, stale)
+    monkeypatch.setattr(routing, "replicas", routing.ReplicaPool([create_engine(f"sqlite:///{stale}")]))
+
+    assert run(client.post("/auth/logout")).status_code == 200
+
+    client.cookies.clear()
+    assert run(client.get("/auth/m", headers={"Cookie": f"access_token={access_token}"})).status_code == 401
+
+
+def count_sessions(run, user_id):
+    from sqlalchemy import func, select
+
+    from app.models.database import AsyncSessionLocal
+    from app.models.refresh_token import UserRefreshToken
+
+    async def count():
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(select(func.count()).where(UserRefreshToken.user_id == user_id))
+
+    return run(count())
+
+
+def test_concurrent_logins_keep_the_session_cap(run, client, make_user):
+    import asyncio
+
+    user_id, email = make_user(PASSWORD)
+    body = {"_e": email, "_p": encrypt_password(PASSWORD), "_k": "test"}
+
+    async def burst():
+        return await asyncio.gather(*(client.post("/auth/signin", json=body) for _ in range(5)))
+
+    responses = run(burst())
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert count_sessions(run, user_id) == 1
+
+
+def test_session_cap_evicts_the_oldest_session(run, client, make_user, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "MAX_SESSIONS_PER_USER", 2)
+    user_id, email = make_user(PASSWORD)
+    tokens = [signin(run, client, email).cookies["access_token"] for _ in range(3)]
+
+    client.cookies.clear()
+    statuses = [run(client.get("/auth/m", headers={"Cookie": f"access_token={token}"})).status_code for token in tokens]
+    assert statuses == [401, 200, 200]
+    assert count_sessions(run, user_id) == 2
+
+
+def test_session_count_is_a_locking_read(run, client, make_user):
+    # SQLite mengabaikan FOR UPDATE, jadi dicek dari SQL versi MySQL-nya
+    from sqlalchemy import event
+    from sqlalchemy.dialects import mysql
+    from sqlalchemy.orm import Session
+
+    statements = []
+
+    def capture(state):
+        if state.is_select:
+            statements.append(str(state.statement.compile(dialect=mysql.dialect())))
+
+    _, email = make_user(PASSWORD)
+    event.listen(Session, "do_orm_execute", capture)
+    try:
+        assert signin(run, client, email).status_code == 200
+    finally:
+        event.remove(Session, "do_orm_execute", capture)
+
+    session_reads = [sql for sql in statements if "FROM exordium_user_refresh_token" in sql and "ORDER BY" in sql]
+    assert session_reads and all(sql.rstrip().endswith("FOR UPDATE") for sql in session_reads)
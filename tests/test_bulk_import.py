@@ -0,0 +1,38 @@
+"""``python -m app.api.bulk_import`` against the test SQLite database."""
+import uuid
+
+from sqlalchemy import func, select
+
+from app.api.bulk_import import import_users
+from app.models.database import SessionLocal
+from app.models.user import User
+
+
+def test_import_csv_skips_existing_and_duplicate_emails(app, tmp_path, make_user):
+    _, existing = make_user()
+    prefix = uuid.uuid4().hex[:8]
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "email,name,pict_uri,google_id\n"
+        f"{prefix}-a@example.com,A,,\n"
+        f"{prefix}-b@example.com,B,https://example.com/b.png,g-{prefix}\n"
+        f"{prefix}-a@example.com,A again,,\n"
+        f"{existing},Existing,,\n"
+        ",no email,,\n"
+        f"{prefix}-c@example.com,,,\n",
+        encoding="utf-8",
+    )
+
+    total, inserted = import_users(str(path), batch_size=2)
+
+    assert (total, inserted) == (5, 3)
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(User.email, User.name, User.google_id).where(User.email.like(f"{prefix}-%")).order_by(User.email)
+        ).all()
+        assert db.scalar(select(func.count()).where(User.email == existing)) == 1
+    assert [tuple(row) for row in rows] == [
+        (f"{prefix}-a@example.com", "A", None),
+        (f"{prefix}-b@example.com", "B", f"g-{prefix}"),
+        (f"{prefix}-c@example.com", None, None),
+    ]
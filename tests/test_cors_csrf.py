@@ -0,0 +1,117 @@
+"""CORS + CSRF middleware on a tiny ASGI app, plus the real app for OPTIONS routing."""
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.middlewares.csrf_middleware import CORSCSRFMiddleware
+
+ORIGIN = "https://exordium.id"
+
+
+def _endpoint(request):
+    headers = {"Vary": request.query_params["vary"]} if "vary" in request.query_params else None
+    return PlainTextResponse("ok", headers=headers)
+
+
+def make_client():
+    inner = Starlette(routes=[
+        Route(path, _endpoint, methods=["GET", "POST", "OPTIONS"]) for path in ("/data/data", "/users/")
+    ])
+    app = CORSCSRFMiddleware(inner, allow_origins=[ORIGIN], max_age=600)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="https://testserver")
+
+
+def request(run, *args, **kwargs):
+    async def go():
+        async with make_client() as client:
+            return await client.request(*args, **kwargs)
+
+    return run(go())
+
+
+def test_preflight_is_answered_by_the_middleware(run):
+    response = request(run, "OPTIONS", "/data/data", headers={
+        "Origin": ORIGIN,
+        "Access-Control-Request-Method": "POST",
+    })
+
+    assert response.status_code == 204
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.headers["access-control-max-age"] == "600"
+
+
+def test_preflight_from_unknown_origin_is_rejected(run):
+    response = request(run, "OPTIONS", "/data/data", headers={
+        "Origin": "https://evil.example.com",
+        "Access-Control-Request-Method": "POST",
+    })
+
+    assert response.status_code == 400
+
+
+def test_safe_methods_skip_csrf(run):
+    for method, path, headers in (
+        ("GET", "/users/", {}),
+        ("HEAD", "/users/", {}),
+        ("OPTIONS", "/users/", {}),
+        ("OPTIONS", "/data/data", {}),
+        ("OPTIONS", "/data/data", {"Origin": ORIGIN}),
+        ("OPTIONS", "/data/data", {"Access-Control-Request-Method": "POST"}),
+    ):
+        assert request(run, method, path, headers=headers).status_code == 200, (method, path, headers)
+
+
+def test_protected_path_needs_csrf_token_on_get(run):
+    assert request(run, "GET", "/data/data").status_code == 403
+    assert request(run, "HEAD", "/data/data").status_code == 403
+    assert request(run, "GET", "/data/data", headers={
+        "Cookie": "XSRF-TOKEN=abc",
+        "X-CSRF-TOKEN": "abc",
+    }).status_code == 200
+
+
+def test_unsafe_methods_need_matching_csrf_token(run):
+    assert request(run, "POST", "/data/data").status_code == 403
+    assert request(run, "POST", "/data/data", headers={
+        "Cookie": "XSRF-TOKEN=abc",
+        "X-CSRF-TOKEN": "other",
+    }).status_code == 403
+    assert request(run, "POST", "/data/data", headers={
+        "Cookie": "XSRF-TOKEN=abc",
+        "X-CSRF-TOKEN": "abc",
+    }).status_code == 200
+
+
+def test_vary_is_merged_into_a_single_header(run):
+    plain = request(run, "GET", "/users/", headers={"Origin": ORIGIN})
+    merged = request(run, "GET", "/users/?vary=Accept-Encoding", headers={"Origin": ORIGIN})
+    already = request(run, "GET", "/users/?vary=origin", headers={"Origin": ORIGIN})
+
+    assert plain.headers.get_list("vary") == ["Origin"]
+    assert merged.headers.get_list("vary") == ["Accept-Encoding, Origin"]
+    assert already.headers.get_list("vary") == ["origin"]
+    assert merged.headers["access-control-allow-origin"] == ORIGIN
+
+
+def test_plain_options_on_the_app_is_not_a_csrf_failure(run, client):
+    response = run(client.options("/data/data"))
+
+    assert response.status_code != 403
+
+
+def test_pagination_cursor_is_exposed_to_allowed_origins(run, client):
+    from app.models.database import SessionLocal
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        db.add_all([User(email=f"cursor-{i}@example.com") for i in range(2)])
+        db.commit()
+
+    response = run(client.get("/users/", params={"limit": 1}, headers={"Origin": ORIGIN}))
+
+    assert response.status_code == 200
+    assert "x-next-cursor" in response.headers
+    exposed = [h.strip().lower() for h in response.headers["access-control-expose-headers"].split(",")]
+    assert "x-next-cursor" in exposed
+    assert response.headers["access-control-allow-origin"] == ORIGIN
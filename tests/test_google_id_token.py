@@ -0,0 +1,176 @@
+"""Local Google id_token verification against a locally generated key set."""
+import hashlib
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import JWTError, jwk, jwt
+from jose.utils import calculate_at_hash
+
+from app.config import settings
+from app.core import google_jwks as google_jwks_module
+from app.core.google_jwks import JWKSCache, verify_google_id_token
+from app.core.http_client import http_client
+from conftest import GOOGLE_CLIENT_ID
+
+ACCESS_TOKEN = "ya29.test-access-token"
+
+
+class GoogleKey:
+    def __init__(self, kid: str):
+        self.kid = kid
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        self.jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid, "use": "sig"}
+
+    def sign(self, **overrides) -> str:
+        now = datetime.utcnow()
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": GOOGLE_CLIENT_ID,
+            "sub": "google-sub-1",
+            "email": "google-user@example.com",
+            "email_verified": True,
+            "name": "Google User",
+            "picture": "https://example.com/g.png",
+            "at_hash": calculate_at_hash(ACCESS_TOKEN, hashlib.sha256),
+            "iat": now,
+            "exp": now + timedelta(hours=1),
+        }
+        claims.update(overrides)
+        return jwt.encode(claims, self.private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+class MockGoogle:
+    """Token endpoint + JWKS endpoint; ``published`` bisa diganti buat simulasi rotasi key."""
+
+    def __init__(self, *keys: GoogleKey):
+        self.published = list(keys)
+        self.id_token = None
+        self.jwks_fetches = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/certs":
+            self.jwks_fetches += 1
+            return httpx.Response(
+                200,
+                json={"keys": [key.jwk for key in self.published]},
+                headers={"Cache-Control": "public, max-age=3600"},
+            )
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"access_token": ACCESS_TOKEN, "id_token": self.id_token})
+        return httpx.Response(404, json={"error": "not_found"})
+
+
+@pytest.fixture
+def google(app, run, monkeypatch):
+    key = GoogleKey("key-1")
+    mock = MockGoogle(key)
+    mock.key = key
+    # cache baru per test; kid miss langsung boleh refresh
+    monkeypatch.setattr(google_jwks_module, "google_jwks", JWKSCache(settings.GOOGLE_JWKS_URI, min_refresh_interval=0))
+    run(http_client.start(transport=httpx.MockTransport(mock.handler)))
+    yield mock
+    run(http_client.start())
+
+
+def test_valid_token_returns_claims(run, google):
+    claims = run(verify_google_id_token(google.key.sign(), access_token=ACCESS_TOKEN))
+
+    assert claims["email"] == "google-user@example.com"
+    assert google.jwks_fetches == 1
+
+
+def test_jwks_is_cached_between_verifications(run, google):
+    for _ in range(3):
+        run(verify_google_id_token(google.key.sign(), access_token=ACCESS_TOKEN))
+
+    assert google.jwks_fetches == 1
+
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "someone-else"},
+    {"iss": "https://evil.example.com"},
+])
+def test_wrong_audience_or_issuer_is_rejected(run, google, overrides):
+    with pytest.raises(JWTError):
+        run(verify_google_id_token(google.key.sign(**overrides), access_token=ACCESS_TOKEN))
+
+
+def test_expired_token_is_rejected(run, google):
+    past = datetime.utcnow() - timedelta(hours=2)
+    token = google.key.sign(iat=past, exp=past + timedelta(hours=1))
+
+    with pytest.raises(JWTError):
+        run(verify_google_id_token(token, access_token=ACCESS_TOKEN))
+
+
+def test_unverified_email_is_rejected(run, google):
+    with pytest.raises(JWTError):
+        run(verify_google_id_token(google.key.sign(email_verified=False), access_token=ACCESS_TOKEN))
+
+
+def test_at_hash_must_match_the_access_token(run, google):
+    with pytest.raises(JWTError):
+        run(verify_google_id_token(google.key.sign(), access_token="ya29.some-other-token"))
+
+
+def test_unknown_kid_triggers_a_jwks_refresh(run, google):
+    run(verify_google_id_token(google.key.sign(), access_token=ACCESS_TOKEN))
+    rotated = GoogleKey("key-2")
+    google.published.append(rotated)
+
+    claims = run(verify_google_id_token(rotated.sign(), access_token=ACCESS_TOKEN))
+
+    assert claims["email"] == "google-user@example.com"
+    assert google.jwks_fetches == 2
+
+
+def test_kid_missing_after_refresh_is_rejected(run, google):
+    stranger = GoogleKey("not-published")
+
+    with pytest.raises(JWTError):
+        run(verify_google_id_token(stranger.sign(), access_token=ACCESS_TOKEN))
+
+
+def test_callback_signs_in_with_a_valid_id_token(run, client, google):
+    google.id_token = google.key.sign(email="callback-user@example.com")
+
+    response = run(client.post("/auth/google/callback", json={"code": "test-code"}))
+
+    assert response.status_code == 200
+    assert response.json()["user"]["email"] == "callback-user@example.com"
+    assert "access_token" in response.cookies
+
+
+def test_callback_rejects_an_invalid_id_token_with_401(run, client, google):
+    google.id_token = google.key.sign(aud="someone-else")
+
+    response = run(client.post("/auth/google/callback", json={"code": "test-code"}))
+
+    assert response.status_code == 401
+
+
+def test_callback_missing_code_is_a_400(run, client, google):
+    assert run(client.post("/auth/google/callback", json={})).status_code == 400
+
+
+def test_callback_keeps_stored_profile_fields_google_omits(run, client, google, make_user):
+    _, email = make_user()
+    google.id_token = google.key.sign(email=email, name=None, picture=None)
+
+    response = run(client.post("/auth/google/callback", json={"code": "test-code"}))
+
+    assert response.status_code == 200
+    assert response.json()["user"]["name"] == "Test User"
+    assert run(client.get("/auth/m")).json()["pict_uri"] == "https://example.com/p.png"
@@ -0,0 +1,93 @@
+"""Shared Google HTTP client, driven through ``httpx.MockTransport``."""
+import httpx
+
+from app.config import settings
+from app.core.http_client import SharedHTTPClient, default_timeout, http_client
+
+
+def test_start_and_close_lifecycle(run):
+    shared = SharedHTTPClient()
+    run(shared.start(transport=httpx.MockTransport(lambda request: httpx.Response(204))))
+    client = shared.client
+
+    assert not client.is_closed
+    run(shared.close())
+    assert client.is_closed
+    # setelah close, akses berikutnya bikin client baru (dipakai di luar lifespan)
+    assert shared.client is not client
+    run(shared.close())
+
+
+def test_restart_closes_the_previous_client(run):
+    shared = SharedHTTPClient()
+    run(shared.start(transport=httpx.MockTransport(lambda request: httpx.Response(204))))
+    first = shared.client
+    run(shared.start(transport=httpx.MockTransport(lambda request: httpx.Response(204))))
+
+    assert first.is_closed
+    assert shared.client is not first
+    run(shared.close())
+
+
+def test_one_client_is_reused_across_requests(run):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(200 if request.url.path == "/ok" else 500)
+
+    shared = SharedHTTPClient()
+    run(shared.start(transport=httpx.MockTransport(handler)))
+    client = shared.client
+
+    for path in ("/ok", "/ok", "/fail"):
+        run(shared.client.get(f"https://google.test{path}"))
+
+    assert shared.client is client
+    assert seen == ["/ok", "/ok", "/fail"]
+    stats = shared.stats()
+    assert stats["requests"] == 3
+    assert stats["error_responses"] == 1
+    assert stats["in_flight"] == 0
+    run(shared.close())
+
+
+def test_transport_errors_are_counted(run):
+    def handler(request):
+        raise httpx.ConnectError("unreachable", request=request)
+
+    shared = SharedHTTPClient()
+    run(shared.start(transport=httpx.MockTransport(handler)))
+    try:
+        run(shared.client.get("https://google.test/"))
+    except httpx.ConnectError:
+        pass
+
+    assert shared.stats()["transport_errors"] == 1
+    assert shared.stats()["in_flight"] == 0
+    run(shared.close())
+
+
+def test_timeouts_come_from_settings(run):
+    timeout = default_timeout()
+    assert timeout.connect == settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS
+    assert timeout.read == settings.HTTP_CLIENT_TIMEOUT_SECONDS
+
+    shared = SharedHTTPClient()
+    run(shared.start(transport=httpx.MockTransport(lambda request: httpx.Response(204))))
+    assert shared.client.timeout == timeout
+    run(shared.close())
+
+
+def test_google_connect_timeout_is_reported(run, client):
+    def handler(request):
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    run(http_client.start(transport=httpx.MockTransport(handler)))
+    try:
+        response = run(client.post("/auth/google/callback", json={"code": "test-code"}))
+    finally:
+        run(http_client.start())
+
+    assert response.status_code == 500
+    assert "timed out" in response.json()["detail"]
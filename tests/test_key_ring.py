@@ -0,0 +1,74 @@
+"""RSA key ring rotation: ciphertexts are matched to keys by kid."""
+import base64
+import os
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from app.core.crypto import RSAKeyRing
+
+
+def write_key(keys_dir, kid):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with open(os.path.join(keys_dir, f"{kid}.pem"), "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return lambda plaintext: key.public_key().encrypt(plaintext, padding.PKCS1v15())
+
+
+def test_single_key_works_without_kid(tmp_path):
+    encrypt = write_key(tmp_path, "private")
+    ring = RSAKeyRing(str(tmp_path))
+    ring.load()
+
+    assert ring.decrypt(encrypt(b"secret")) == b"secret"
+    assert ring.decrypt(encrypt(b"secret"), kid="private") == b"secret"
+
+
+def test_rotation_keeps_old_keys_valid_by_kid(tmp_path):
+    encrypt_old = write_key(tmp_path, "private")
+    ring = RSAKeyRing(str(tmp_path), active_kid="k2")
+    ring.load()
+    cached_old_ciphertext = encrypt_old(b"old-client")
+
+    encrypt_new = write_key(tmp_path, "k2")
+    ring.load()
+
+    assert ring.active_kid == "k2"
+    assert ring.decrypt(cached_old_ciphertext, kid="private") == b"old-client"
+    assert ring.decrypt(encrypt_new(b"new-client"), kid="k2") == b"new-client"
+
+
+def test_rotation_requires_a_kid(tmp_path):
+    encrypt_old = write_key(tmp_path, "private")
+    write_key(tmp_path, "k2")
+    ring = RSAKeyRing(str(tmp_path), active_kid="k2")
+    ring.load()
+
+    # tanpa kid tidak ditebak: key yang salah cuma menghasilkan byte acak
+    with pytest.raises(KeyError, match="key id required"):
+        ring.decrypt(encrypt_old(b"old-client"))
+    with pytest.raises(KeyError, match="unknown key id"):
+        ring.decrypt(encrypt_old(b"old-client"), kid="k3")
+
+
+def test_signin_without_kid_during_rotation_is_a_400(run, client, make_user, monkeypatch, tmp_path):
+    from app.core import crypto
+
+    encrypt_old = write_key(tmp_path, "private")
+    write_key(tmp_path, "k2")
+    ring = RSAKeyRing(str(tmp_path), active_kid="k2")
+    ring.load()
+    monkeypatch.setattr(crypto, "key_ring", ring)
+    _, email = make_user("pw-rotation")
+    password = base64.b64encode(encrypt_old(b"pw-rotation")).decode()
+
+    without_kid = run(client.post("/auth/signin", json={"_e": email, "_p": password}))
+    with_kid = run(client.post("/auth/signin", json={"_e": email, "_p": password, "_k": "private"}))
+
+    assert without_kid.status_code == 400
+    assert with_kid.status_code == 200
@@ -0,0 +1,72 @@
+"""Prometheus text output and engine instrumentation."""
+from sqlalchemy import create_engine, text
+
+from app.core import metrics
+
+
+def test_pool_checkout_is_timed_without_touching_pool_internals(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}")
+    metrics.instrument_engine(engine, "test_pool")
+
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    assert "_do_get" not in vars(engine.pool)
+    assert metrics._pool_wait["test_pool"].count == 3
+    assert metrics._pool_connects["test_pool"] == 1
+    output = metrics.render()
+    assert 'exordium_db_pool_checkout_wait_seconds_count{engine="test_pool"} 3' in output
+    assert 'exordium_db_pool_connections_opened_total{engine="test_pool"} 1' in output
+
+
+def test_async_engine_checkouts_are_timed(run, app):
+    from app.models.database import async_engine
+
+    before = metrics._pool_wait["async"].count
+
+    async def query():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    run(query())
+
+    assert metrics._pool_wait["async"].count == before + 1
+
+
+def test_metrics_endpoint_is_off_without_a_token(run, client, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+
+    assert run(client.get("/metrics")).status_code == 404
+    assert run(client.get("/metrics", headers={"Authorization": "Bearer "})).status_code == 404
+
+
+def test_metrics_endpoint_requires_the_bearer_token(run, client, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+    assert run(client.get("/metrics")).status_code == 401
+    assert run(client.get("/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
+    assert run(client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})).status_code == 200
+
+
+def test_every_metric_has_help_and_type(run, client, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    monkeypatch.setitem(metrics._collectors, "test_source", lambda: {"queue_depth": 2, "label": "skipped", "flag": True})
+
+    response = run(client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}))
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    helped = {line.split()[2] for line in lines if line.startswith("# HELP ")}
+    typed = {line.split()[2] for line in lines if line.startswith("# TYPE ")}
+    assert helped == typed
+    assert "exordium_test_source_queue_depth" in typed
+    assert "exordium_test_source_queue_depth 2" in lines
+    assert "exordium_test_source_flag" not in typed
+    assert "exordium_db_pool_checkout_wait_seconds" in typed
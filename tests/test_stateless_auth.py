@@ -0,0 +1,109 @@
+"""``AUTH_STATELESS``: profile from token claims, revocations through the denylist."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.config import settings
+from app.core.revocation import revocation_list
+from app.core.session_cache import session_cache
+from app.core.token_backend import token_backend
+from app.models.database import AsyncSessionLocal
+from app.models.refresh_token import UserRefreshToken
+from app.models.revoked_session import RevokedSession
+from conftest import encrypt_password
+
+PASSWORD = "stateless-password"
+
+
+@pytest.fixture
+def stateless(run, app, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    monkeypatch.setattr(revocation_list, "_revoked", {})
+    monkeypatch.setattr(revocation_list, "_watermark", None)
+    monkeypatch.setattr(revocation_list, "_synced_at", None)
+    run(revocation_list.sync())
+    session_cache.clear()
+    yield revocation_list
+    session_cache.clear()
+
+
+def signin(run, client, email):
+    response = run(client.post("/auth/signin", json={"_e": email, "_p": encrypt_password(PASSWORD), "_k": "test"}))
+    assert response.status_code == 200
+    client.cookies.clear()
+    return response.cookies["access_token"]
+
+
+def me(run, client, access_token):
+    return run(client.get("/auth/m", headers={"Cookie": f"access_token={access_token}"})).status_code
+
+
+def session_id_of(access_token):
+    return token_backend.decode(access_token)["session_id"]
+
+
+def end_session_elsewhere(run, session_id, revoke=True):
+    """Logout di worker lain: sesi dihapus (+ baris pencabutan), denylist worker ini tidak disentuh."""
+    async def go():
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(UserRefreshToken).where(UserRefreshToken.session_id == session_id))
+            if revoke:
+                db.add(RevokedSession(session_id=session_id, expires_at=datetime.utcnow() + timedelta(days=1)))
+            await db.commit()
+
+    run(go())
+
+
+def test_access_token_carries_the_profile(run, client, make_user, stateless):
+    _, email = make_user(PASSWORD)
+
+    claims = token_backend.decode(signin(run, client, email))
+
+    assert claims["email"] == email
+    assert claims["name"] == "Test User"
+
+
+def test_revocation_by_another_worker_is_picked_up_by_sync(run, client, make_user, stateless):
+    _, email = make_user(PASSWORD)
+    access_token = signin(run, client, email)
+    session_id = session_id_of(access_token)
+
+    end_session_elsewhere(run, session_id)
+    # sebelum sync: token masih diterima dari claim (delay maksimal satu interval sync)
+    assert me(run, client, access_token) == 200
+
+    run(stateless.sync())
+
+    assert stateless.is_revoked(session_id)
+    assert me(run, client, access_token) == 401
+
+
+def test_stale_denylist_falls_back_to_the_session_check(run, client, make_user, stateless, monkeypatch):
+    _, email = make_user(PASSWORD)
+    access_token = signin(run, client, email)
+    # sesi hilang tanpa baris pencabutan: cuma cek DB yang bisa tahu
+    end_session_elsewhere(run, session_id_of(access_token), revoke=False)
+    assert me(run, client, access_token) == 200
+
+    monkeypatch.setattr(stateless, "_synced_at", None)
+    assert not stateless.fresh
+
+    assert me(run, client, access_token) == 401
+
+
+def test_login_eviction_revokes_the_evicted_session(run, client, make_user, stateless):
+    assert settings.MAX_SESSIONS_PER_USER == 1
+    _, email = make_user(PASSWORD)
+    first = signin(run, client, email)
+    second = signin(run, client, email)
+    evicted = session_id_of(first)
+
+    async def revoked_rows():
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(select(RevokedSession.session_id).where(RevokedSession.session_id == evicted))).all()
+
+    assert stateless.is_revoked(evicted)
+    assert len(run(revoked_rows())) == 1
+    assert me(run, client, first) == 401
+    assert me(run, client, second) == 200
@@ -0,0 +1,57 @@
+"""User read routes: rows are returned as plain dicts, the schema must still describe them."""
+
+
+def test_user_without_google_id_or_name(run, client):
+    from app.models.database import SessionLocal
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        user = User(email="no-google@example.com")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    response = run(client.get(f"/users/{user_id}"))
+
+    assert response.status_code == 200
+    assert response.json() == {"id": user_id, "google_id": None, "email": "no-google@example.com", "name": None}
+    listed = run(client.get("/users/", params={"after_id": user_id - 1, "limit": 1})).json()
+    assert listed == [response.json()]
+
+
+def test_response_schema_allows_null_profile_fields(app):
+    from app.schemas.user import UserResponse
+
+    assert UserResponse(**{"id": 1, "google_id": None, "email": "a@example.com", "name": None})
+    assert set(UserResponse.model_fields) == {"id", "google_id", "email", "name"}
+    schema = app.openapi()["components"]["schemas"]["UserResponse"]
+    assert set(schema["required"]) == {"id", "email"}
+
+
+def test_recently_written_user_is_read_from_the_primary(run, client, monkeypatch, tmp_path):
+    import shutil
+
+    from sqlalchemy import create_engine, update
+
+    from app.models import routing
+    from app.models.database import SessionLocal
+    from app.models.user import User
+    from conftest import DB_PATH
+
+    with SessionLocal() as db:
+        user = User(email="sticky@example.com", name="Before")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    stale = tmp_path / "replica.db"
+    shutil.copyfile(DB_PATH, stale)
+    monkeypatch.setattr(routing, "replicas", routing.ReplicaPool([create_engine(f"sqlite:///{stale}")]))
+    monkeypatch.setattr(routing, "_sticky", {})
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.id == user_id).values(name="After"))
+        db.commit()
+
+    # belum ditandai: replica yang ketinggalan yang menjawab
+    assert run(client.get(f"/users/{user_id}")).json()["name"] == "Before"
+    routing.mark_written(user_id)
+    assert run(client.get(f"/users/{user_id}")).json()["name"] == "After"